@@ -3,19 +3,32 @@
 This package contains the main crews for the real estate workflow:
 
 1. ResearchCrew - Sequential process for property discovery and data extraction
-2. LocationAnalyzerCrew - Hierarchical process for geospatial amenity analysis  
+2. LocationAnalyzerCrew - Parallel per-property geospatial amenity analysis
 3. InteriorDesignCrew - Sequential process for room redesign visualization
 
 Each crew outputs JSON files that are consumed by the next phase via Flow @listen decorators.
+Crews are imported lazily on first attribute access (PEP 562), so importing the
+package does not pull in every crew's tools and dependencies.
 """
 
-from real_ai_agents.crews.research_crew.research_crew import ResearchCrew
-from real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew import LocationAnalyzerCrew
-from real_ai_agents.crews.interior_design_crew.interior_design_crew import InteriorDesignCrew
+import importlib
 
-__all__ = [
-    "ResearchCrew",
-    "LocationAnalyzerCrew",
-    "InteriorDesignCrew",
-]
+_LAZY = {
+    "ResearchCrew": "real_ai_agents.crews.research_crew.research_crew",
+    "LocationAnalyzerCrew": "real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew",
+    "InteriorDesignCrew": "real_ai_agents.crews.interior_design_crew.interior_design_crew",
+}
 
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
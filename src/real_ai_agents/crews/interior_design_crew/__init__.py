@@ -1,4 +1,12 @@
 """Interior Design Crew module."""
-from real_ai_agents.crews.interior_design_crew.interior_design_crew import InteriorDesignCrew
+
+
+def __getattr__(name):
+    if name == "InteriorDesignCrew":
+        from real_ai_agents.crews.interior_design_crew.interior_design_crew import InteriorDesignCrew
+
+        return InteriorDesignCrew
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["InteriorDesignCrew"]
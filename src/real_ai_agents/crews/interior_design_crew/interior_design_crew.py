@@ -9,15 +9,21 @@ This crew handles the Design Phase:
 Process: Sequential - Each step depends on the previous output.
 """
 
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Type
 import os
-import json
 
-from crewai import Agent, Crew, Process, Task, LLM
+from pydantic import BaseModel, ValidationError
+
+from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.task_output import TaskOutput
 
+from real_ai_agents.llms import nova_lite as nova_llm, nova_pro as nova_llm2
+from real_ai_agents.utils.fastjson import first_char, loads, strip_fences, JSONDecodeError
+from real_ai_agents.utils.config import VERBOSE, cached_configs
+from real_ai_agents.utils.reports import report_writer
+from real_ai_agents.utils.validation import format_validation_errors, is_json_error
 from real_ai_agents.tools.gemini_image_tools import (
     redesign_room_image,
     generate_room_description,
@@ -28,34 +34,65 @@ from real_ai_agents.tools.gemini_image_tools import (
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
 
+# ============== OUTPUT SCHEMAS ==============
+# Validators are compiled by pydantic-core once, when the classes are created,
+# so each guardrail call is a single native validation pass.
+
+class RoomAnalysisProperty(BaseModel):
+    property_id: Any
+    rooms: List[Any]
+
+
+class RoomAnalysisOutput(BaseModel):
+    properties: List[RoomAnalysisProperty]
+
+
+class DesignReportOutput(BaseModel):
+    metadata: Any
+    properties: List[Any]
+
+
 # ============== GUARDRAILS ==============
 
+def _parse_json_output(raw: str) -> Any:
+    """Parse JSON output, stripping code fences when present or parsing fails."""
+    if first_char(raw) == "`":
+        return loads(strip_fences(raw))
+    try:
+        return loads(raw)
+    except JSONDecodeError:
+        return loads(strip_fences(raw))
+
+
+def _validate_output(model: Type[BaseModel], raw: Any) -> BaseModel:
+    """Parse and validate ``raw`` against ``model`` in one native pass.
+
+    Fenced JSON text is unwrapped before validating; other text that fails
+    to parse is retried once with code fences stripped.
+    """
+    if isinstance(raw, (bytes, bytearray)):
+        return model.model_validate_json(raw)
+    if not isinstance(raw, str):
+        return model.model_validate(raw)
+    if first_char(raw) == "`":
+        return model.model_validate_json(strip_fences(raw))
+    try:
+        return model.model_validate_json(raw)
+    except ValidationError as e:
+        if not is_json_error(e):
+            raise
+        return model.model_validate_json(strip_fences(raw))
+
+
 def validate_room_analysis(result: TaskOutput) -> Tuple[bool, Any]:
     """Validate that room analysis contains required fields."""
     try:
-        if isinstance(result.raw, str):
-            try:
-                data = json.loads(result.raw.replace("```json", "").replace("```", "").strip())
-            except json.JSONDecodeError:
+        try:
+            _validate_output(RoomAnalysisOutput, result.raw)
+        except ValidationError as e:
+            if is_json_error(e):
                 return (False, "Output must be valid JSON")
-        else:
-            data = result.raw
-        
-        errors = []
-        
-        if "properties" not in data:
-            errors.append("Missing 'properties' array")
-        elif not isinstance(data["properties"], list):
-            errors.append("'properties' must be an array")
-        else:
-            for i, prop in enumerate(data["properties"]):
-                if "property_id" not in prop:
-                    errors.append(f"Property {i+1} missing property_id")
-                if "rooms" not in prop or not isinstance(prop.get("rooms"), list):
-                    errors.append(f"Property {i+1} missing 'rooms' array")
-        
-        if errors:
-            return (False, "Validation failed:\n" + "\n".join(errors))
+            return (False, "Validation failed:\n" + format_validation_errors(e))
         
         return (True, result.raw)
         
@@ -66,24 +103,12 @@ def validate_room_analysis(result: TaskOutput) -> Tuple[bool, Any]:
 def validate_design_report(result: TaskOutput) -> Tuple[bool, Any]:
     """Validate the final design report has all required sections."""
     try:
-        if isinstance(result.raw, str):
-            try:
-                data = json.loads(result.raw.replace("```json", "").replace("```", "").strip())
-            except json.JSONDecodeError:
+        try:
+            _validate_output(DesignReportOutput, result.raw)
+        except ValidationError as e:
+            if is_json_error(e):
                 return (False, "Output must be valid JSON")
-        else:
-            data = result.raw
-        
-        errors = []
-        
-        if "metadata" not in data:
-            errors.append("Missing metadata section")
-        
-        if "properties" not in data or not isinstance(data.get("properties"), list):
-            errors.append("Missing or invalid properties array")
-        
-        if errors:
-            return (False, "Report validation failed:\n" + "\n".join(errors))
+            return (False, "Report validation failed:\n" + format_validation_errors(e))
         
         return (True, result.raw)
         
@@ -91,22 +116,7 @@ def validate_design_report(result: TaskOutput) -> Tuple[bool, Any]:
         return (False, f"Validation error: {str(e)}")
 
 
-nova_llm = LLM(
-    model="bedrock/us.amazon.nova-2-lite-v1:0",
-    temperature=0.1,
-    stop_sequences=[]
-    
-)
-
-
-nova_llm2 = LLM(
-    model="bedrock/us.amazon.nova-2-pro-v1:0",
-    temperature=0.1,
-    stop_sequences=[]
-
-)
-
-
+@cached_configs
 @CrewBase
 class InteriorDesignCrew:
     """Interior Design Crew - Sequential process for room visualization.
@@ -130,9 +140,9 @@ class InteriorDesignCrew:
         """Design coordinator that analyzes room images."""
         return Agent(
             config=self.agents_config["design_coordinator"],  # type: ignore[index]
-            verbose=True,
-            llm=nova_llm2,
-            max_iter=6,
+            verbose=VERBOSE,
+            llm=nova_llm2(),
+            max_iter=4,
             cache=True,
             tools=[generate_room_description],
         )
@@ -142,8 +152,8 @@ class InteriorDesignCrew:
         """Room redesigner that generates transformed room images."""
         return Agent(
             config=self.agents_config["room_redesigner"],  # type: ignore[index]
-            verbose=True,
-            llm=nova_llm,
+            verbose=VERBOSE,
+            llm=nova_llm(),
             max_iter=10,
             max_rpm=10,
             cache=True,
@@ -156,9 +166,9 @@ class InteriorDesignCrew:
         """Report agent that compiles design results to JSON."""
         return Agent(
             config=self.agents_config["report_agent"],  # type: ignore[index]
-            verbose=True,
-            llm=nova_llm,
-            max_iter=5,
+            verbose=VERBOSE,
+            llm=nova_llm(),
+            max_iter=2,
             cache=True,
         )
 
@@ -183,7 +193,7 @@ class InteriorDesignCrew:
         """Task to compile all designs into JSON report."""
         return Task(
             config=self.tasks_config["compile_design_report"],  # type: ignore[index]
-            output_file="output/design_results.json",
+            callback=report_writer("output/design_results.json", parse=_parse_json_output),
             guardrail=validate_design_report,
             guardrail_max_retries=2,
         )
@@ -196,5 +206,5 @@ class InteriorDesignCrew:
             tasks=self.tasks,
             process=Process.sequential,
             memory=False,
-            verbose=True,
+            verbose=VERBOSE,
         )
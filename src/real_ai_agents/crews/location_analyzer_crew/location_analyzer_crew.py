@@ -1,67 +1,115 @@
-from typing import List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
+import asyncio
 import os
-import json
+import uuid
 
-from crewai import Agent, Crew, Process, Task, LLM
+from pydantic import BaseModel, Field, ValidationError
+
+from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.task_output import TaskOutput
 
-from real_ai_agents.tools.google_maps_tools import google_places_geocode_tool, google_places_nearby_tool
+from real_ai_agents.llms import nova_lite as nova_llm, nova_pro as nova_llm2
+from real_ai_agents.utils.fastjson import first_char, loads, dumps
+from real_ai_agents.utils.config import VERBOSE, cached_configs
+from real_ai_agents.utils.reports import append_ndjson, report_writer
+from real_ai_agents.utils.validation import format_validation_errors, is_json_error
+from real_ai_agents.tools.google_maps_tools import (
+    google_places_area_scan_tool,
+    google_places_geocode_tool,
+    google_places_nearby_batch_tool,
+    google_places_nearby_tool,
+)
 
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
+# Maximum number of approved properties analyzed per run
+MAX_PROPERTIES = 6
+
+# Concurrent property analyses (each one issues its own Google Places calls)
+MAX_PARALLEL_ANALYSES = max(1, int(os.getenv("LOCATION_MAX_PARALLEL", "3")))
+
+# Each finished analysis is appended here, so completed work survives a failed
+# report. One file per run, so concurrent flows keep their own logs.
+ANALYSES_LOG = "output/location_analyses.{run_id}.ndjson"
+
+# Amenity categories every property analysis must score
+REQUIRED_AMENITIES = frozenset({
+    "markets", "gyms", "bus_parks", "railway_terminals",
+    "stadiums", "malls", "airports", "seaports",
+})
+# Sorted once so guardrail errors come out in a stable order
+_AMENITY_ORDER = tuple(sorted(REQUIRED_AMENITIES))
+
+
+# ============== OUTPUT SCHEMAS ==============
+# Validators are compiled by pydantic-core once, when the classes are created,
+# so each guardrail call is a single native validation pass.
+
+class Coordinates(BaseModel):
+    lat: float
+    lng: float
+
+
+class LocationAnalysisOutput(BaseModel):
+    # Numeric ids are fine, and only the required amenity categories are
+    # checked (in validate_location_analysis), as in the original guardrail
+    property_id: Any
+    coordinates: Coordinates
+    amenities: Dict[str, Any]
+    overall_score: Any
+    advantages: List[Any]
+    disadvantages: List[Any]
+
+
+class LocationReportOutput(BaseModel):
+    metadata: Any
+    properties: List[Any] = Field(min_length=1)
+    comparison: Optional[Any] = None
+
+
+def approved_properties(research_results: Any) -> List[Any]:
+    """Return the approved property list (max 6) from the research JSON."""
+    if isinstance(research_results, (str, bytes, bytearray)):
+        data = loads(research_results)
+    else:
+        data = research_results or {}
+    key = "properties" if "properties" in data else "listings"
+    return list(data.get(key) or [])[:MAX_PROPERTIES]
+
 
 # ============== GUARDRAILS ==============
 
 def validate_location_analysis(result: TaskOutput) -> Tuple[bool, Any]:
     """Validate that location analysis contains all 8 amenity categories and required fields."""
     try:
-        # Parse the result
-        if isinstance(result.raw, str):
-            try:
-                data = json.loads(result.raw)
-            except json.JSONDecodeError:
-                return (False, "Output must be valid JSON")
-        else:
-            data = result.raw
-        
-        required_amenities = [
-            "markets", "gyms", "bus_parks", "railway_terminals",
-            "stadiums", "malls", "airports", "seaports"
-        ]
-        
-        errors = []
-        
-        # Check property_id
-        if not data.get("property_id"):
-            errors.append("Missing property_id")
-        
-        # Check coordinates
-        coords = data.get("coordinates", {})
-        if not coords.get("lat") or not coords.get("lng"):
-            errors.append("Missing coordinates (lat/lng)")
-        
-        # Check all amenity categories exist
-        amenities = data.get("amenities", {})
-        for amenity in required_amenities:
-            if amenity not in amenities:
-                errors.append(f"Missing amenity category: {amenity}")
+        # Parse and validate in one native pass for JSON text
+        # Text that cannot start a JSON object fails without a parse attempt
+        if isinstance(result.raw, str) and first_char(result.raw) != "{":
+            return (False, "Output must be valid JSON")
+        try:
+            if isinstance(result.raw, (str, bytes, bytearray)):
+                analysis = LocationAnalysisOutput.model_validate_json(result.raw)
             else:
-                # Each amenity should have a score
-                if "score" not in amenities[amenity]:
-                    errors.append(f"Missing score for {amenity}")
-        
-        # Check overall_score
-        if "overall_score" not in data:
-            errors.append("Missing overall_score")
+                analysis = LocationAnalysisOutput.model_validate(result.raw)
+        except ValidationError as e:
+            if is_json_error(e):
+                return (False, "Output must be valid JSON")
+            return (False, "Validation failed:\n" + format_validation_errors(e))
         
-        # Check advantages and disadvantages
-        if "advantages" not in data or not isinstance(data.get("advantages"), list):
-            errors.append("Missing or invalid advantages array")
-        if "disadvantages" not in data or not isinstance(data.get("disadvantages"), list):
-            errors.append("Missing or invalid disadvantages array")
+        # Check all amenity categories exist, and each one has a score
+        # with direct membership tests (no per-call set building or sorting)
+        amenities = analysis.amenities
+        errors = [] if analysis.property_id else ["Missing property_id"]
+        errors.extend(f"Missing amenity category: {a}" for a in _AMENITY_ORDER if a not in amenities)
+        errors.extend(
+            f"Missing score for {a}"
+            for a in _AMENITY_ORDER
+            if a in amenities
+            and not (isinstance(amenities[a], dict) and "score" in amenities[a])
+        )
         
         if errors:
             return (False, "Validation failed:\n" + "\n".join(errors))
@@ -75,65 +123,42 @@ def validate_location_analysis(result: TaskOutput) -> Tuple[bool, Any]:
 def validate_location_report(result: TaskOutput) -> Tuple[bool, Any]:
     """Validate the final location report has all required sections."""
     try:
-        if isinstance(result.raw, str):
-            try:
-                data = json.loads(result.raw)
-            except json.JSONDecodeError:
+        # Text that cannot start a JSON object fails without a parse attempt
+        if isinstance(result.raw, str) and first_char(result.raw) != "{":
+            return (False, "Output must be valid JSON")
+        try:
+            if isinstance(result.raw, (str, bytes, bytearray)):
+                report = LocationReportOutput.model_validate_json(result.raw)
+            else:
+                report = LocationReportOutput.model_validate(result.raw)
+        except ValidationError as e:
+            if is_json_error(e):
                 return (False, "Output must be valid JSON")
-        else:
-            data = result.raw
-        
-        errors = []
-        
-        # Check metadata
-        if "metadata" not in data:
-            errors.append("Missing metadata section")
-        
-        # Check properties array
-        if "properties" not in data or not isinstance(data.get("properties"), list):
-            errors.append("Missing or invalid properties array")
-        elif len(data["properties"]) == 0:
-            errors.append("Properties array is empty")
+            return (False, "Report validation failed:\n" + format_validation_errors(e))
         
         # Check comparison section (if multiple properties)
-        if len(data.get("properties", [])) > 1 and "comparison" not in data:
-            errors.append("Missing comparison section for multiple properties")
-        
-        if errors:
-            return (False, "Report validation failed:\n" + "\n".join(errors))
+        if len(report.properties) > 1 and report.comparison is None:
+            return (False, "Report validation failed:\nMissing comparison section for multiple properties")
         
         return (True, result.raw)
         
     except Exception as e:
         return (False, f"Validation error: {str(e)}")
 
-nova_llm = LLM(
-    model="bedrock/us.amazon.nova-2-lite-v1:0",
-    temperature=0.1,
-    stop_sequences=[]
-    
-)
-
-
-
-nova_llm2 = LLM(
-    model="bedrock/us.amazon.nova-2-pro-v1:0",
-    temperature=0.1,
-    stop_sequences=[]
-)
-
 
+@cached_configs
 @CrewBase
 class LocationAnalyzerCrew:
-    """Location Analyzer Crew - Hierarchical process for geospatial analysis.
+    """Location Analyzer Crew - Parallel geospatial analysis.
     
     This crew handles the Intelligence Phase:
-    - Manager assigns approved properties (max 6) to analyzer agents
+    - Approved properties (max 6) are assigned one per analyzer, in order
     - Each analyzer handles ALL 8 amenity types for one property
-    - Analyzers work in parallel using async_execution
+    - Analyzers run concurrently via analyze_all (asyncio.gather)
     - Report agent compiles results to JSON
     
-    Process: Hierarchical - Manager coordinates parallel property analysis.
+    Process: Sequential - the report agent compiles the finished analyses.
+    Use ``kickoff_async`` to run the analyses and the report in one call.
     
     Amenity Types (6km radius, 50km for airports):
     - Markets, Gyms, Bus parks, Railway terminals
@@ -146,105 +171,38 @@ class LocationAnalyzerCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
-    @agent
-    def manager(self) -> Agent:
-        """Manager agent that coordinates property assignments."""
-        return Agent(
-            config=self.agents_config["manager"],  # type: ignore[index]
-            verbose=True,
-            llm=nova_llm2,
-            max_iter=8,
-            cache=True,
-        )
-
     @agent
     def location_analyzer_1(self) -> Agent:
         """Location analyzer for property 1."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
+        return self._analyzer(1)
 
-    @agent
-    def location_analyzer_2(self) -> Agent:
-        """Location analyzer for property 2."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
+    def _analyzer(self, index: int) -> Agent:
+        """Location analyzer for property ``index``, built once per crew.
 
-    @agent
-    def location_analyzer_3(self) -> Agent:
-        """Location analyzer for property 3."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_4(self) -> Agent:
-        """Location analyzer for property 4."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
+        All analyzers share the same config, tools and LLM instance. They are
+        memoized on the instance, so they are freed with the crew.
+        """
+        analyzers = self.__dict__.setdefault("_analyzers", {})
+        if index not in analyzers:
+            analyzers[index] = self._new_analyzer()
+        return analyzers[index]
 
-    @agent
-    def location_analyzer_5(self) -> Agent:
-        """Location analyzer for property 5."""
+    def _new_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config["location_analyzer"],  # type: ignore[index]
             respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
+            verbose=VERBOSE,
+            llm=nova_llm(),
             max_iter=6,
             max_rpm=15,
             cache=True,
             max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_6(self) -> Agent:
-        """Location analyzer for property 6."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=nova_llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
+            tools=[
+                google_places_area_scan_tool,
+                google_places_geocode_tool,
+                google_places_nearby_batch_tool,
+                google_places_nearby_tool,
+            ],
         )
 
     @agent
@@ -252,106 +210,93 @@ class LocationAnalyzerCrew:
         """Report agent that compiles location intelligence to JSON."""
         return Agent(
             config=self.agents_config["report_agent"],  # type: ignore[index]
-            verbose=True,
-            llm=nova_llm2,
-            max_iter=5,
+            verbose=VERBOSE,
+            llm=nova_llm2(),
+            max_iter=2,
             cache=True,
         )
 
-    @task
-    def assign_properties(self) -> Task:
-        """Task for manager to assign properties to analyzers."""
-        return Task(
-            config=self.tasks_config["assign_properties"],  # type: ignore[index]
-        )
-
-    @task
-    def analyze_property_1(self) -> Task:
-        """Async task for analyzer 1."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_1(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_2(self) -> Task:
-        """Async task for analyzer 2."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_2(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_3(self) -> Task:
-        """Async task for analyzer 3."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_3(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_4(self) -> Task:
-        """Async task for analyzer 4."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_4(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_5(self) -> Task:
-        """Async task for analyzer 5."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_5(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_6(self) -> Task:
-        """Async task for analyzer 6."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_6(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
     @task
     def compile_location_report(self) -> Task:
         """Task to compile all location analysis into JSON report."""
         return Task(
             config=self.tasks_config["compile_location_report"],  # type: ignore[index]
-            output_file="output/location_intelligence.json",
+            callback=report_writer("output/location_intelligence.json"),
             guardrail=validate_location_report,
             guardrail_max_retries=2,
         )
 
     @crew
     def crew(self) -> Crew:
-        """Creates the Location Analyzer Crew with hierarchical process."""
+        """Creates the Location Analyzer Crew report stage (sequential)."""
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
-            process=Process.hierarchical,
-            manager_agent=self.manager(),
+            process=Process.sequential,
             memory=False,
-            planning=True,
-            verbose=True,
-            
+            planning=False,
+            verbose=VERBOSE,
+        )
+
+    async def analyze_all(
+        self,
+        properties: List[Any],
+        max_parallel: int = MAX_PARALLEL_ANALYSES,
+        run_id: Optional[str] = None,
+    ) -> List[str]:
+        """Analyze each property with its own analyzer, ``max_parallel`` at a time.
+
+        Only as many analyzers and tasks as there are properties are built.
+        Returns the raw JSON analysis for each property, in input order, and
+        appends each one to ``ANALYSES_LOG`` for ``run_id`` (a fresh id when
+        not given) as soon as it completes.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        log_path = ANALYSES_LOG.format(run_id=run_id or uuid.uuid4().hex)
+        # Only this run's own log is reset (a resumed run starts it over)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+        async def analyze(index: int, prop: Any) -> str:
+            analyzer = self._analyzer(index)
+            analysis = Task(
+                config=self.tasks_config["analyze_property"],  # type: ignore[index]
+                agent=analyzer,
+                guardrail=validate_location_analysis,
+                guardrail_max_retries=2,
+            )
+            async with semaphore:
+                result = await Crew(
+                    agents=[analyzer],
+                    tasks=[analysis],
+                    process=Process.sequential,
+                    memory=False,
+                    verbose=VERBOSE,
+                ).kickoff_async(inputs={"property": dumps(prop)})
+            append_ndjson(log_path, result.raw)
+            return result.raw
+
+        return await asyncio.gather(
+            *(analyze(i, prop) for i, prop in enumerate(properties, start=1))
         )
 
+    async def kickoff_async(
+        self,
+        inputs: Dict[str, Any],
+        research_data: Optional[dict] = None,
+        run_id: Optional[str] = None,
+    ):
+        """Analyze the approved properties concurrently, then compile the report.
+
+        ``research_data`` is the already-parsed ``research_results``, when the
+        caller has it, so the JSON is not decoded again here. ``run_id`` names
+        the per-run analyses log (see ``analyze_all``).
+        """
+        if research_data is None:
+            research_data = inputs.get("research_results")
+        properties = approved_properties(research_data)
+        analyses = await self.analyze_all(properties, run_id=run_id)
+        return await self.crew().kickoff_async(inputs={
+            **inputs,
+            "location_analyses": "\n\n".join(analyses),
+        })
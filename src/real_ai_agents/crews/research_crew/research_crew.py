@@ -1,40 +1,68 @@
+import asyncio
+import itertools
 import os
-import json
-from typing import List, Optional, Any, Tuple
-from pydantic import BaseModel
-from crewai import Agent, Crew, Process, Task, LLM
+import re
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.task_output import TaskOutput
-from crewai_tools import TavilySearchTool
-from real_ai_agents.tools.exa_search_tool import ExaSearchTool
+from real_ai_agents.llms import nova_lite_report as nova_llm, qwen as llm_2
+from real_ai_agents.utils.fastjson import JSONDecodeError, dumps, first_object
+from real_ai_agents.utils.config import VERBOSE, cached_configs
+from real_ai_agents.utils.reports import report_writer
+from real_ai_agents.utils.validation import CachedSchemaModel, format_validation_errors, is_json_error
+from real_ai_agents.tools.exa_search_tool import ExaMultiSearchTool, ExaSearchTool
 from real_ai_agents.tools.crawl4ai_tool import crawl_extract_tool
 
 
-
 # =======================
-# ENV
+# PIPELINE SETTINGS
 # =======================
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-# GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-# BROWSER_USE_API_KEY = os.getenv("BROWSER_USE_API_KEY")
+# URLs per extraction task and concurrent extractor crews. Set the batch size
+# to 1 and workers to 6 to fan out one extraction per URL. All URLs of a batch
+# go into one prompt, so batches are kept between 1 and 6.
+EXTRACT_BATCH_SIZE = max(1, min(int(os.getenv("RESEARCH_EXTRACT_BATCH", "3")), 6))
+EXTRACT_WORKERS = max(1, int(os.getenv("RESEARCH_EXTRACT_WORKERS", "4")))
+# Extraction crews in flight across all pipelines in the process (run_many
+# multiplies the workers), and an optional requests-per-minute cap for each
+# extraction crew, to stay under the provider's rate limit.
+EXTRACT_CONCURRENCY = max(1, int(os.getenv("RESEARCH_EXTRACT_CONCURRENCY", "6")))
+EXTRACT_MAX_RPM = int(os.getenv("RESEARCH_EXTRACT_MAX_RPM", "0")) or None
+
+# One semaphore per event loop; asyncio primitives cannot be shared across loops
+_EXTRACT_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION_NAME = os.getenv("AWS_DEFAULT_REGION")
+def _extract_slots() -> asyncio.Semaphore:
+    """Return the process-wide extraction semaphore for the running loop."""
+    loop = asyncio.get_running_loop()
+    slots = _EXTRACT_SLOTS.get(loop)
+    if slots is None:
+        slots = _EXTRACT_SLOTS[loop] = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+    return slots
 
 
 # =======================
 # OUTPUT MODELS
+# Task output models cache their JSON schema (see CachedSchemaModel).
 # =======================
 
-class SearchListingsOutput(BaseModel):
+class SearchListingsOutput(CachedSchemaModel):
+    model_config = ConfigDict(extra="forbid")
+
     urls: List[str]
     platforms: List[str]
 
 
 class ExtractedListing(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     listing_url: str
     platform: Optional[str] = None
     address: Optional[str] = None
@@ -43,30 +71,77 @@ class ExtractedListing(BaseModel):
     bedrooms: Optional[float] = None
     bathrooms: Optional[float] = None
     description: Optional[str] = None
-    images: List[str] = []
+    images: List[str] = Field(default_factory=list)
     facts_and_features: Optional[List[str]] = None
     contact_info: Optional[str] = None
 
 
-class ExtractListingsOutput(BaseModel):
+class ExtractListingsOutput(CachedSchemaModel):
     listings: List[ExtractedListing]
     summary: dict
 
 
 class ValidatedListing(ExtractedListing):
     quality_score: int
-    validation_notes: List[str] = []
+    validation_notes: List[str] = Field(default_factory=list)
 
 
-class ValidateListingsOutput(BaseModel):
+class ValidateListingsOutput(CachedSchemaModel):
     listings: List[ValidatedListing]
     summary: dict
 
 
+# Listings scored below this count as flagged in the pipeline summary
+PASS_SCORE = 70
+
+
 # =======================
 # GUARDRAILS
 # =======================
 
+# Listing platforms rejected by the search guardrail
+_BLOCKED_PLATFORMS = frozenset({"zillow"})
+_BLOCKED_HOSTS = frozenset({"zillow.com"})
+
+
+def _is_blocked_host(url: str) -> bool:
+    """True if ``url``'s host is a blocked domain or one of its subdomains."""
+    host = urlsplit(url).hostname or ""
+    return host in _BLOCKED_HOSTS or any(host.endswith("." + d) for d in _BLOCKED_HOSTS)
+
+
+def _contains_html(text: Any) -> bool:
+    """Case-insensitive search for ``<html`` in a str or bytes-like output.
+
+    Jumps between '<' characters with ``find`` (a memchr scan) and only
+    compares the four characters after each one, which is far cheaper than
+    an IGNORECASE regex or lowercasing the whole output. str is scanned as
+    is; encoding it to bytes first would cost a full extra pass.
+    """
+    lt, tag = ("<", "html") if isinstance(text, str) else (b"<", b"html")
+    i = text.find(lt)
+    while i != -1:
+        if text[i + 1 : i + 5].lower() == tag:
+            return True
+        i = text.find(lt, i + 1)
+    return False
+
+
+def _has_html_leak(obj: Any) -> bool:
+    """True if a parsed output holds a 'raw_content' key or an '<html' string.
+
+    Walks dicts/lists directly and stops at the first hit, so structured
+    output never has to be serialized just to be scanned.
+    """
+    if isinstance(obj, str):
+        return _contains_html(obj)
+    if isinstance(obj, dict):
+        return "raw_content" in obj or any(_has_html_leak(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_html_leak(v) for v in obj)
+    return False
+
+
 def validate_search_used(result: TaskOutput) -> Tuple[bool, Any]:
     """
     Enforces:
@@ -76,55 +151,70 @@ def validate_search_used(result: TaskOutput) -> Tuple[bool, Any]:
     - Required keys exist
     """
     raw = result.raw
-
-    if not isinstance(raw, str):
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8", "replace")
+    elif not isinstance(raw, str):
         return False, "Output is not a string"
 
-    raw = raw.strip()
-
-    # Extract JSON object from response (Nova may wrap in text)
+    # Parse and validate the outermost {...} span in one native pass;
+    # extra="forbid" rejects keys other than 'urls' and 'platforms'. If that
+    # span is not valid JSON (text after the object containing "}"), fall
+    # back to scanning for the first complete object.
     start = raw.find("{")
-    end = raw.rfind("}")
-    if start == -1 or end == -1:
+    if start == -1:
         return False, "No JSON object found in output"
-
+    end = raw.rfind("}") + 1
+    pure = False
     try:
-        data = json.loads(raw[start : end + 1])
-    except Exception as e:
-        return False, f"Invalid JSON: {e}"
-
-    # Required keys
-    if set(data.keys()) != {"urls", "platforms"}:
-        return False, "JSON must contain ONLY 'urls' and 'platforms' keys"
-
-    # URLs validation
-    if not isinstance(data["urls"], list) or len(data["urls"]) < 3:
-        return False, "At least 3 URLs are required"
-
-    if not all(isinstance(u, str) and u.startswith("http") for u in data["urls"]):
-        return False, "All URLs must be valid http(s) strings"
+        try:
+            data = SearchListingsOutput.model_validate_json(raw[start:end])
+            pure = start == 0 and end == len(raw)
+        except ValidationError as e:
+            if not is_json_error(e):
+                raise
+            data = SearchListingsOutput.model_validate(first_object(raw))
+    except JSONDecodeError:
+        return False, "Invalid JSON output"
+    except ValidationError as e:
+        return False, "JSON must contain ONLY 'urls' and 'platforms' lists:\n" + format_validation_errors(e)
 
     # Platform validation (zillow is blocked)
-    blocked_platforms = {"zillow"}
-    if any(p in blocked_platforms for p in data["platforms"]):
+    if any(p in _BLOCKED_PLATFORMS for p in data.platforms):
         return False, "Zillow is blocked - do not include zillow URLs"
 
-    return True, data
+    # URLs validation: scheme, blocked hosts and duplicates in one pass
+    urls = {}
+    for url in data.urls:
+        if not url.startswith(("http://", "https://")):
+            return False, "All URLs must be valid http(s) strings"
+        if _is_blocked_host(url):
+            return False, "Zillow is blocked - do not include zillow URLs"
+        urls[url] = None
 
+    if len(urls) < 3:
+        return False, "At least 3 unique URLs are required"
 
+    # Output that is already bare JSON without duplicates passes through
+    # untouched; anything else is re-serialized and returned as text so CrewAI
+    # replaces the task output with the unwrapped, deduped list.
+    if pure and len(urls) == len(data.urls):
+        return True, raw
+    data.urls = list(urls)
+    return True, data.model_dump_json()
 
-def validate_extract_used(result: TaskOutput) -> Tuple[bool, Any]:
-    """Ensure extraction output is valid and no raw HTML leaked"""
-    raw = result.raw if isinstance(result.raw, str) else json.dumps(result.raw)
 
-    if "listings" not in raw:
-        return False, "Missing listings array"
+_WORD_RE = re.compile(r"\S+")
 
-    if "raw_content" in raw or "<html" in raw.lower():
-        return False, "Raw HTML leaked into output"
 
-    return True, result.raw
+def _has_min_words(text: str, n: int) -> bool:
+    """True if ``text`` has at least ``n`` whitespace-separated words.
 
+    Stops scanning at the ``n``-th word instead of splitting the whole text.
+    """
+    # n words need at least n characters plus n - 1 separators
+    if len(text) < 2 * n - 1:
+        return False
+    return sum(1 for _ in itertools.islice(_WORD_RE.finditer(text), n)) == n
 
 
 def crawl_extraction_guardrail(result: TaskOutput) -> Tuple[bool, Any]:
@@ -132,103 +222,90 @@ def crawl_extraction_guardrail(result: TaskOutput) -> Tuple[bool, Any]:
     Detects hallucinated extraction by enforcing
     crawl-only output signals with realistic thresholds.
     """
-    raw = result.raw if isinstance(result.raw, str) else json.dumps(result.raw)
+    raw = result.raw
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8", "replace")
 
-    # Extract JSON object from response (Nova may wrap in text)
-    start = raw.find("{")
-    end = raw.rfind("}")
-    if start == -1 or end == -1:
-        return False, "No JSON object found in output"
+    if not isinstance(raw, str):
+        # Already structured: scan it in place instead of re-serializing
+        if _has_html_leak(raw):
+            return False, "Raw HTML detected"
+        data = raw
+    else:
+        # Cheapest check first: leaked HTML anywhere fails before any parsing
+        if _contains_html(raw):
+            return False, "Raw HTML detected"
 
-    try:
-        data = json.loads(raw[start : end + 1])
-    except Exception:
+        # Extract JSON object from response (Nova may wrap in text)
+        try:
+            data = first_object(raw)
+        except JSONDecodeError:
+            return False, "Invalid JSON output"
+        if data is None:
+            return False, "No JSON object found in output"
+
+    if not isinstance(data, dict):
         return False, "Invalid JSON output"
 
     listings = data.get("listings", [])
     if not listings:
         return False, "No listings extracted"
 
+    # Realistic browser-only signals, cheapest first; the description word
+    # scan runs last.
     for listing in listings:
-        images = listing.get("images", [])
-        description = listing.get("description", "") or ""
-        facts = listing.get("facts_and_features", []) or []
-
-        # Realistic browser-only signals
-        if len(images) < 2:
+        if len(listing.get("images") or ()) < 2:
             return False, "Too few images — likely not browser-extracted"
 
-        if len(description.split()) < 30:
-            return False, "Description too short — likely hallucinated"
-
+        facts = listing.get("facts_and_features")
         if not isinstance(facts, list) or len(facts) < 2:
             return False, "Insufficient facts/features — likely not browser data"
 
-        # HTML leakage check
-        if "<html" in description.lower():
-            return False, "Raw HTML detected"
+        if not _has_min_words(listing.get("description") or "", 30):
+            return False, "Description too short — likely hallucinated"
 
     return True, result.raw
 
 
 
 # =======================
-# LLM CONFIG    
+# TOOLS
 # =======================
 
-nova_llm = LLM(
-    model="bedrock/us.amazon.nova-2-lite-v1:0",
-    temperature=0.0,
-    max_tokens=5000,
-    stop_sequences=[],
-)
-
-
-nova_llm_2 = LLM(
-    model="bedrock/google.gemma-3-27b-it",
-    temperature=0.0, 
-    stop_sequences=[],
-
-)
-
-
-llm_2 = LLM(
-    model="openrouter/qwen/qwen3.5-35b-a3b",
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY
-)
+exa_search = ExaSearchTool()
+exa_search_multi = ExaMultiSearchTool()
 
 
 # =======================
-# PATCH: Strip stopSequences for models that don't support it
-# CrewAI's agent executor sets stop words internally AFTER construction,
-# so stop_sequences=[] in the constructor is not enough.
+# CREW
 # =======================
-def _patch_inference_config(llm_instance):
-    """Wrap _get_inference_config to always remove stopSequences."""
-    original_fn = llm_instance._get_inference_config
 
-    def patched():
-        config = original_fn()
-        config.pop("stopSequences", None)
-        return config
+def _parse_search_output(result: Any) -> SearchListingsOutput:
+    """Build ``SearchListingsOutput`` from the scraper crew's output.
 
-    llm_instance._get_inference_config = patched
+    ``json_dict`` has already passed validate_search_used and CrewAI's own
+    ``output_json`` validation, so it is wrapped without validating again;
+    only raw text falls back to full validation.
+    """
+    if result.json_dict:
+        return SearchListingsOutput.model_construct(**result.json_dict)
+    raw = result.raw
+    return SearchListingsOutput.model_validate_json(raw[raw.find("{") : raw.rfind("}") + 1])
 
-_patch_inference_config(nova_llm)
-_patch_inference_config(nova_llm_2)
 
-# =======================
-# TOOLS
-# =======================
+def _parse_listings(result: Any) -> List[Dict[str, Any]]:
+    """Return the ``listings`` array from an extraction batch's output.
 
-exa_search = ExaSearchTool()
+    Raw text is parsed with ``first_object``, the same lenient scan
+    crawl_extraction_guardrail accepted it with.
+    """
+    if result.json_dict:
+        return result.json_dict.get("listings", [])
+    data = first_object(result.raw)
+    return data.get("listings", []) if isinstance(data, dict) else []
 
 
-# =======================
-# CREW
-# =======================
-
+@cached_configs
 @CrewBase
 class ResearchCrew:
     agents: List[Agent]
@@ -237,6 +314,13 @@ class ResearchCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    # Model per role, as shared factories from real_ai_agents.llms. A variant
+    # crew overrides these in a subclass instead of redefining the agents.
+    scraper_llm = staticmethod(llm_2)
+    extractor_llm = staticmethod(llm_2)
+    validator_llm = staticmethod(llm_2)
+    report_llm = staticmethod(nova_llm)
+
     # -------- Agents --------
 
     @agent
@@ -244,9 +328,9 @@ class ResearchCrew:
         """Scraper agent using Gemini Pro - specialized for URL discovery."""
         return Agent(
             config=self.agents_config["scraper"],
-            llm=llm_2,
-            tools=[exa_search],
-            verbose=True,
+            llm=self.scraper_llm(),
+            tools=[exa_search_multi, exa_search],
+            verbose=VERBOSE,
             # cache=True,
             allow_delegation=False,
             max_iter=4,
@@ -257,11 +341,25 @@ class ResearchCrew:
     @agent
     def extractor(self) -> Agent:
         """Extractor agent using Gemini Pro with Browser Use Cloud tool."""
+        return self._extractor(1)
+
+    def _extractor(self, index: int) -> Agent:
+        """Extractor for pipeline worker ``index``, built once per crew.
+
+        Concurrent workers each get their own agent so executor state is not
+        shared. They are memoized on the instance, so they are freed with the crew.
+        """
+        extractors = self.__dict__.setdefault("_extractors", {})
+        if index not in extractors:
+            extractors[index] = self._new_extractor()
+        return extractors[index]
+
+    def _new_extractor(self) -> Agent:
         return Agent(
             config=self.agents_config["extractor"],
-            llm=llm_2,
+            llm=self.extractor_llm(),
             tools=[crawl_extract_tool],  # Crawl4AI extraction tool
-            verbose=False,
+            verbose=VERBOSE,
             allow_delegation=False,
             max_iter=4,
             max_retry_limit=6,
@@ -276,8 +374,8 @@ class ResearchCrew:
         """Validator agent using DeepSeek - cheap reasoning."""
         return Agent(
             config=self.agents_config["validator"],
-            llm=llm_2,
-            verbose=True,
+            llm=self.validator_llm(),
+            verbose=VERBOSE,
             max_iter=4,
             max_retry_limit=6,
             respect_context_window=False,
@@ -288,9 +386,9 @@ class ResearchCrew:
         """Report agent using Gemini Flash - formatting only."""
         return Agent(
             config=self.agents_config["report_agent"],
-            llm=nova_llm,
-            verbose=False,
-            max_iter=4,
+            llm=self.report_llm(),
+            verbose=VERBOSE,
+            max_iter=2,
             max_retry_limit=6,
             respect_context_window=True,
         )
@@ -330,7 +428,7 @@ class ResearchCrew:
         """Compile validated data into final JSON report."""
         return Task(
             config=self.tasks_config["compile_research_report"],
-            output_file="output/research_results.json",
+            callback=report_writer("output/research_results.json"),
         )
 
     # -------- Crew --------
@@ -342,6 +440,115 @@ class ResearchCrew:
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
             planning=False,
-        )
\ No newline at end of file
+        )
+
+    # -------- Pipeline --------
+    # Guardrails already run off the event loop: kickoff_async executes the
+    # whole crew on a worker thread. Output parsing here goes through
+    # asyncio.to_thread for the same reason, so concurrent pipelines
+    # (run_many) keep making progress while one parses a large result.
+
+    async def _search(self, inputs: Dict[str, Any]) -> SearchListingsOutput:
+        """Run the scraper alone and return the validated listing URLs."""
+        result = await Crew(
+            agents=[self.scraper()],
+            tasks=[self.search_listings()],
+            process=Process.sequential,
+            verbose=VERBOSE,
+        ).kickoff_async(inputs=inputs)
+        return await asyncio.to_thread(_parse_search_output, result)
+
+    async def _extract_worker(self, index: int, queue: "asyncio.Queue") -> List[Dict[str, Any]]:
+        """Extract URL chunks from ``queue`` until it yields ``None``."""
+        extractor = self._extractor(index)
+        extracted = []
+        while (urls := await queue.get()) is not None:
+            extraction = Task(
+                config=self.tasks_config["extract_listing_batch"],
+                agent=extractor,
+                output_json=ValidateListingsOutput,
+                guardrail=crawl_extraction_guardrail,
+                guardrail_max_retries=3,
+            )
+            try:
+                async with _extract_slots():
+                    result = await Crew(
+                        agents=[extractor],
+                        tasks=[extraction],
+                        process=Process.sequential,
+                        verbose=VERBOSE,
+                        max_rpm=EXTRACT_MAX_RPM,
+                    ).kickoff_async(inputs={"urls": "\n".join(urls), "url_count": len(urls)})
+                listings = await asyncio.to_thread(_parse_listings, result)
+            except Exception as e:
+                print(f"Extraction failed for {urls}: {e}")
+                listings = []
+            extracted.append({"attempted": len(urls), "listings": listings})
+        return extracted
+
+    async def run_pipeline(self, inputs: Dict[str, Any]):
+        """Search, extract and score in parallel chunks, then compile the report.
+
+        URLs are queued in chunks of ``EXTRACT_BATCH_SIZE`` and consumed by
+        ``EXTRACT_WORKERS`` extractors, so a slow listing page only delays its
+        own chunk. Each extractor also scores its listings, which replaces the
+        separate validator round-trip of the sequential crew; guardrails still
+        run on every chunk.
+        """
+        search = await self._search(inputs)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(0, len(search.urls), EXTRACT_BATCH_SIZE):
+            queue.put_nowait(search.urls[i : i + EXTRACT_BATCH_SIZE])
+        workers = min(EXTRACT_WORKERS, queue.qsize()) or 1
+        for _ in range(workers):
+            queue.put_nowait(None)
+
+        batches = [
+            batch
+            for worker_batches in await asyncio.gather(
+                *(self._extract_worker(i, queue) for i in range(1, workers + 1))
+            )
+            for batch in worker_batches
+        ]
+        listings = [listing for batch in batches for listing in batch["listings"]]
+        attempted = sum(batch["attempted"] for batch in batches)
+        passed = sum(
+            1 for listing in listings if (listing.get("quality_score") or 0) >= PASS_SCORE
+        )
+        validated = {
+            "listings": listings,
+            "summary": {
+                "attempted": attempted,
+                "successful": len(listings),
+                "failed": max(attempted - len(listings), 0),
+                "total": len(listings),
+                "passed": passed,
+                "flagged": len(listings) - passed,
+            },
+        }
+
+        report = Task(
+            config=self.tasks_config["compile_listings_report"],
+            agent=self.report_agent(),
+            callback=report_writer("output/research_results.json"),
+        )
+        return await Crew(
+            agents=[self.report_agent()],
+            tasks=[report],
+            process=Process.sequential,
+            verbose=VERBOSE,
+        ).kickoff_async(inputs={**inputs, "validated_listings": dumps(validated)})
+
+    @classmethod
+    async def run_many(cls, inputs_list: List[Dict[str, Any]]) -> List[Any]:
+        """Run one research pipeline per input concurrently, on fresh crews.
+
+        Results are returned in input order. Every run still writes
+        output/research_results.json, so that file holds the last one to finish.
+        """
+        return await asyncio.gather(
+            *(cls().run_pipeline(inputs=inputs) for inputs in inputs_list)
+        )
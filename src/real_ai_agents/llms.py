@@ -0,0 +1,137 @@
+"""
+Shared LLM clients for all crews.
+
+Every crew imports its models from here so identical configurations resolve
+to one LLM instance (and one underlying boto3 / HTTP client) per process.
+Clients are created lazily, the first time an agent asks for one.
+"""
+
+import os
+import functools
+from typing import Optional
+
+import httpx
+import litellm
+from crewai import LLM
+
+from real_ai_agents.utils.config import env_flag
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Mark the system prompt (agent role/backstory, identical on every iteration
+# and retry) as a provider prompt-cache prefix. Tool results and other
+# dynamic messages are left uncached. Set LLM_PROMPT_CACHE=0 to disable.
+PROMPT_CACHE = env_flag("LLM_PROMPT_CACHE", default=True)
+_CACHE_INJECTION_POINTS = [{"location": "message", "role": "system"}]
+
+
+@functools.cache
+def shared_http_client() -> httpx.Client:
+    """Pooled (HTTP/2 when available) client for every LiteLLM-backed model.
+
+    Installed as ``litellm.client_session`` so all OpenRouter calls, from any
+    agent or crew, reuse the same connections. Only the sync client is
+    shared: CrewAI runs LLM calls on worker threads, and an async client
+    would be bound to a single event loop.
+    """
+    client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+    )
+    litellm.client_session = client
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def get_llm(
+    model: str,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> LLM:
+    """Return the shared LLM for this configuration, creating it on first use."""
+    kwargs = {
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "base_url": base_url,
+        "api_key": api_key,
+    }
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+    if model.startswith("bedrock/"):
+        kwargs["stop_sequences"] = []
+    else:
+        shared_http_client()
+        if PROMPT_CACHE:
+            kwargs["cache_control_injection_points"] = _CACHE_INJECTION_POINTS
+    return LLM(model=model, **kwargs)
+
+
+# =======================
+# PATCH: Strip stopSequences for models that don't support it
+# CrewAI's agent executor sets stop words internally AFTER construction,
+# so stop_sequences=[] in the constructor is not enough.
+# =======================
+def _patch_inference_config(llm_instance):
+    """Wrap _get_inference_config to always remove stopSequences."""
+    original_fn = llm_instance._get_inference_config
+
+    def patched():
+        config = original_fn()
+        config.pop("stopSequences", None)
+        return config
+
+    llm_instance._get_inference_config = patched
+
+
+# =======================
+# SHARED INSTANCES
+# Built on first call so importing a crew does not construct any clients.
+# =======================
+
+@functools.cache
+def nova_lite() -> LLM:
+    """Amazon Nova 2 Lite (location analysis + interior design)."""
+    return get_llm("bedrock/us.amazon.nova-2-lite-v1:0", temperature=0.1)
+
+
+@functools.cache
+def nova_pro() -> LLM:
+    """Amazon Nova 2 Pro (location + interior design reports)."""
+    return get_llm("bedrock/us.amazon.nova-2-pro-v1:0", temperature=0.1)
+
+
+@functools.cache
+def nova_lite_report() -> LLM:
+    """Deterministic Nova 2 Lite for report formatting (research)."""
+    llm = get_llm("bedrock/us.amazon.nova-2-lite-v1:0", temperature=0.0, max_tokens=5000)
+    _patch_inference_config(llm)
+    return llm
+
+
+@functools.cache
+def gemma() -> LLM:
+    """Gemma 3 on Bedrock."""
+    llm = get_llm("bedrock/google.gemma-3-27b-it", temperature=0.0)
+    _patch_inference_config(llm)
+    return llm
+
+
+@functools.cache
+def qwen() -> LLM:
+    """Qwen 3.5 via OpenRouter (research agents)."""
+    return get_llm(
+        "openrouter/qwen/qwen3.5-35b-a3b",
+        max_tokens=8000,
+        base_url=OPENROUTER_BASE_URL,
+        api_key=OPENROUTER_API_KEY,
+    )
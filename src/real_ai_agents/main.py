@@ -4,20 +4,41 @@ AI Real Estate Agent Flow - Find & Redesign
 AMP-Optimized Input Version
 """
 
-import json
 import asyncio
+import os
+import threading
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 from crewai.flow.flow import Flow, listen, start
 from crewai.flow.persistence import persist
 from crewai.flow.human_feedback import human_feedback, HumanFeedbackResult
 
+from real_ai_agents.utils.cache import tool_cache
+from real_ai_agents.utils.cancel import cancellable
+from real_ai_agents.utils.fastjson import JSONDecodeError, dumps, dumps_bytes, first_char, loads, raw_json
+from real_ai_agents.utils.reports import write_bytes
+
 from real_ai_agents.crews.research_crew.research_crew import ResearchCrew
 from real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew import LocationAnalyzerCrew
 from real_ai_agents.crews.interior_design_crew.interior_design_crew import InteriorDesignCrew
 
 
+# Research reports by (query, excluded sites): a repeated search is answered
+# without re-running the crew. On disk under TOOL_CACHE_DIR when set. Queries
+# are compared case- and whitespace-insensitively, so "Ojodu,  lagos" and
+# "Ojodu, Lagos" share an entry.
+RESEARCH_CACHE_TTL = float(os.getenv("RESEARCH_CACHE_TTL", "3600"))
+_RESEARCH_CACHE = tool_cache("research", maxsize=128, ttl=RESEARCH_CACHE_TTL)
+
+# Upper bound in seconds on the location + design phase; 0 means no limit.
+# On timeout the flow fails instead of hanging, and both crews are stopped at
+# their next LLM or tool call (see utils/cancel.py).
+PARALLEL_PHASE_TIMEOUT = float(os.getenv("PARALLEL_PHASE_TIMEOUT", "0")) or None
+
+_BANNER = "\n🏠 AI Real Estate Agent - Find & Redesign\n" + "=" * 50
+
+
 # =========================
 # FLOW STATE
 # =========================
@@ -48,6 +69,42 @@ class RealEstateState(BaseModel):
     properties_analyzed: int = Field(default=0, exclude=True)
     rooms_redesigned: int = Field(default=0, exclude=True)
 
+    # Parsed research_results, kept for the approval step so the JSON is not
+    # parsed twice. In memory only: a flow restored from persistence re-parses.
+    _research_data: Optional[dict] = PrivateAttr(default=None)
+    # Same for filtered_research_results, handed to the location crew
+    _filtered_data: Optional[dict] = PrivateAttr(default=None)
+
+
+def _parse_property_ids(feedback: Optional[str]) -> List[str]:
+    """Read approved property IDs from reviewer feedback.
+
+    A JSON array is parsed directly; anything else (a Python-style list with
+    single quotes, or plain ``prop_001, prop_002``) is split on commas.
+    """
+    text = (feedback or "").strip()
+    if first_char(text) == "[":
+        try:
+            ids = loads(text)
+            return [str(i) for i in ids] if isinstance(ids, list) else []
+        except JSONDecodeError:
+            text = text[1:].rstrip().removesuffix("]")
+    return [i for part in text.split(",") if (i := part.strip().strip("'\""))]
+
+
+class _DesignMetadata(BaseModel):
+    total_rooms_redesigned: int = 0
+
+
+class _DesignSummary(BaseModel):
+    """Narrow view of the design report: only the room count is materialized.
+
+    Validating the raw JSON against it skips building Python objects for the
+    rest of the (image-heavy) report.
+    """
+
+    metadata: _DesignMetadata = _DesignMetadata()
+
 
 # =========================
 # FLOW
@@ -60,37 +117,52 @@ class RealEstateFlow(Flow[RealEstateState]):
     def initialize_search(self):
         """Initialize search from state (populated by kickoff inputs)."""
 
-        print("\n🏠 AI Real Estate Agent - Find & Redesign")
-        print("=" * 50)
-
-        print(f"Location: {self.state.location}")
-        print(f"Bedrooms: {self.state.bedrooms}")
+        # One write for the whole banner instead of a print per line
+        print(
+            f"{_BANNER}\n"
+            f"Location: {self.state.location}\n"
+            f"Bedrooms: {self.state.bedrooms}"
+        )
 
     # -------------------------
     # PHASE 1 — RESEARCH
     # -------------------------
 
     @listen(initialize_search)
-    def run_research_phase(self):
-
-        search_query = f"{self.state.bedrooms or ''} bedroom {self.state.property_type} in {self.state.location}"
-        if self.state.max_price:
-            search_query += f" under {self.state.max_price}"
-        search_query += f" ({self.state.rent_frequency} rent)"
+    async def run_research_phase(self):
+
+        price = f" under {self.state.max_price}" if self.state.max_price else ""
+        search_query = (
+            f"{self.state.bedrooms or ''} bedroom {self.state.property_type} "
+            f"in {self.state.location}{price} ({self.state.rent_frequency} rent)"
+        ).strip()
+        cache_key = (
+            " ".join(search_query.casefold().split()),
+            tuple(sorted(self.state.excluded_sites)),
+        )
 
-        result = ResearchCrew().crew().kickoff(inputs={
-            "search_criteria": search_query.strip(),
-            "excluded_sites": self.state.excluded_sites
-        })
+        # A retry asks for fresh results, so it skips the cached report
+        raw = _RESEARCH_CACHE.get(cache_key) if self.state.retry_count == 0 else None
+        fresh = raw is None
+        if fresh:
+            result = await ResearchCrew().run_pipeline(inputs={
+                "search_criteria": search_query,
+                "excluded_sites": self.state.excluded_sites
+            })
+            raw = result.raw
 
-        self.state.research_results = result.raw
+        self.state.research_results = raw
+        self.state._research_data = None
 
         try:
-            data = json.loads(result.raw)
+            data = loads(raw)
+            self.state._research_data = data
+            if fresh:  # only reports that parse are worth reusing
+                _RESEARCH_CACHE.set(cache_key, raw)
             key = "properties" if "properties" in data else "listings"
             if key in data:
                 self.state.properties_found = len(data[key])
-        except:
+        except (JSONDecodeError, TypeError):
             pass
 
         print(f"Found {self.state.properties_found} properties")
@@ -113,31 +185,29 @@ class RealEstateFlow(Flow[RealEstateState]):
     @listen("approved")
     def filter_approved_properties(self, result: HumanFeedbackResult):
 
-        try:
-            approved_ids = json.loads(result.feedback)
-            self.state.approved_property_ids = approved_ids
-        except:
-            self.state.approved_property_ids = []
+        self.state.approved_property_ids = _parse_property_ids(result.feedback)
 
         try:
-            data = json.loads(self.state.research_results)
+            data = self.state._research_data
+            if data is None:
+                data = loads(self.state.research_results)
             key = "properties" if "properties" in data else "listings"
             if key in data:
-                data[key] = [
-                    p for p in data[key]
-                    if p.get("id") in self.state.approved_property_ids
-                ]
+                approved = frozenset(self.state.approved_property_ids)
+                data = {**data, key: [p for p in data[key] if p.get("id") in approved]}
                 self.state.properties_approved = len(data[key])
 
-            self.state.filtered_research_results = json.dumps(data)
-        except:
+            self.state.filtered_research_results = dumps(data)
+            self.state._filtered_data = data
+        except (JSONDecodeError, TypeError, AttributeError):
             self.state.filtered_research_results = self.state.research_results
+            self.state._filtered_data = None
 
     @listen("retry")
-    def handle_retry_search(self, result: HumanFeedbackResult):
+    async def handle_retry_search(self, result: HumanFeedbackResult):
         self.state.retry_count += 1
         self.state.user_feedback = result.feedback
-        return self.run_research_phase()
+        return await self.run_research_phase()
 
     # -------------------------
     # PHASE 2 — PARALLEL
@@ -154,18 +224,48 @@ class RealEstateFlow(Flow[RealEstateState]):
             "design_style": self.state.design_style_preference
         }
 
-        location_task = asyncio.create_task(
-            LocationAnalyzerCrew().crew().kickoff_async(inputs=inputs)
-        )
-
-        design_task = asyncio.create_task(
-            InteriorDesignCrew().crew().kickoff_async(inputs=inputs)
-        )
-
-        location_result, design_result = await asyncio.gather(
-            location_task,
-            design_task
+        # The crews run on worker threads, where task.cancel() cannot reach
+        # them; setting stop blocks their remaining LLM and tool calls
+        stop = threading.Event()
+
+        location_task = asyncio.create_task(cancellable(
+            LocationAnalyzerCrew().kickoff_async(
+                inputs=inputs,
+                research_data=self.state._filtered_data,
+                run_id=self.flow_id,
+            ),
+            stop,
+        ))
+
+        design_task = asyncio.create_task(cancellable(
+            InteriorDesignCrew().crew().kickoff_async(inputs=inputs),
+            stop,
+        ))
+
+        # If either crew fails, stop the other instead of letting it spend
+        # LLM calls on a phase whose result is discarded
+        done, pending = await asyncio.wait(
+            (location_task, design_task),
+            timeout=PARALLEL_PHASE_TIMEOUT,
+            return_when=asyncio.FIRST_EXCEPTION
         )
+        if pending:
+            stop.set()
+        for task in pending:
+            task.cancel()
+        # Let the cancelled crews (and the location crew's per-property
+        # tasks) finish unwinding before the phase fails
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+        if pending:
+            raise TimeoutError(
+                f"Location/design phase did not finish within {PARALLEL_PHASE_TIMEOUT:g}s"
+            )
+
+        location_result, design_result = location_task.result(), design_task.result()
 
         self.state.location_results = location_result.raw
         self.state.design_results = design_result.raw
@@ -173,11 +273,10 @@ class RealEstateFlow(Flow[RealEstateState]):
         self.state.properties_analyzed = self.state.properties_approved
 
         try:
-            design_data = json.loads(design_result.raw)
-            self.state.rooms_redesigned = design_data.get(
-                "metadata", {}
-            ).get("total_rooms_redesigned", 0)
-        except:
+            self.state.rooms_redesigned = _DesignSummary.model_validate_json(
+                design_result.raw
+            ).metadata.total_rooms_redesigned
+        except ValidationError:
             pass
 
     # -------------------------
@@ -209,8 +308,18 @@ class RealEstateFlow(Flow[RealEstateState]):
             },
         }
 
-        with open("output/unified_report.json", "w") as f:
-            json.dump(final_report, f, indent=2)
+        # Phase outputs are JSON text already: splice them into the file as
+        # nested JSON rather than escaping them into strings a second time.
+        # The research report was parsed in phase 1, so it is not re-checked.
+        phases = {
+            "research": raw_json(self.state.research_results, self.state._research_data),
+            "location": raw_json(self.state.location_results),
+            "design": raw_json(self.state.design_results),
+        }
+        write_bytes(
+            "output/unified_report.json",
+            dumps_bytes({**final_report, "phases": phases}, indent=True, newline=True),
+        )
 
         print("Flow Complete")
         return final_report
@@ -10,6 +10,8 @@ This module exports all custom tools used by the crews:
 from real_ai_agents.tools.google_maps_tools import (
     google_places_geocode_tool,
     google_places_nearby_tool,
+    google_places_nearby_batch_tool,
+    google_places_area_scan_tool,
 )
 
 from real_ai_agents.tools.gemini_image_tools import (
@@ -28,6 +30,8 @@ __all__ = [
     # Google Maps Tools
     "google_places_geocode_tool",
     "google_places_nearby_tool",
+    "google_places_nearby_batch_tool",
+    "google_places_area_scan_tool",
     # Gemini Image Tools
     "redesign_room_image",
     "generate_room_description",
@@ -10,12 +10,15 @@ Uses Google Gemini for the browser agent.
 
 import os
 import asyncio
+import inspect
 import json
 import logging
-from typing import Type, Optional
+from typing import List, Type, Optional
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from real_ai_agents.utils.loop import run_async
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +37,31 @@ BROWSER_USE_API_KEY = os.getenv("BROWSER_USE_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 
+# Default extraction task for real estate listing pages
+DEFAULT_EXTRACTION_TASK = """
+Extract ALL property listing details from this page:
+
+REQUIRED FIELDS:
+- listing_url: The current page URL
+- platform: The website name (e.g., Zillow, Realtor.com)
+- address: Full property address
+- price: Listed price with currency
+- price_frequency: Rental frequency if applicable (monthly, weekly, etc.)
+- bedrooms: Number of bedrooms
+- bathrooms: Number of bathrooms
+- description: Full property description (verbatim text)
+- images: List of ALL image URLs on the page
+- facts_and_features: Dict of property facts (sqft, year built, etc.)
+- contact: Agent/property manager contact info
+
+IMPORTANT:
+- Extract ONLY what is visible on the rendered page
+- Include ALL image URLs you can find
+- Return data as valid JSON
+- If a field is not found, use null
+"""
+
+
 class BrowserExtractInput(BaseModel):
     """Input schema for BrowserExtractTool."""
     url: str = Field(
@@ -79,20 +107,10 @@ class BrowserExtractTool(BaseTool):
     
     def _run(self, url: str, extraction_task: str = None) -> str:
         """Synchronous wrapper for the async browser extraction."""
-        logger.info(f"🌐 BrowserExtractTool called with URL: {url}")
+        logger.info("🌐 BrowserExtractTool called with URL: %s", url)
         
-        if not BROWSER_USE_AVAILABLE:
-            error = "browser-use package not installed. Run: pip install browser-use"
-            logger.error(f"❌ {error}")
-            return json.dumps({"error": error})
-        
-        if not BROWSER_USE_API_KEY:
-            error = "BROWSER_USE_API_KEY environment variable not set"
-            logger.error(f"❌ {error}")
-            return json.dumps({"error": error})
-        
-        if not GOOGLE_API_KEY:
-            error = "GOOGLE_API_KEY environment variable not set (required for Gemini browser agent)"
+        error = self._config_error()
+        if error:
             logger.error(f"❌ {error}")
             return json.dumps({"error": error})
         
@@ -100,38 +118,13 @@ class BrowserExtractTool(BaseTool):
         
         # Default extraction task for real estate
         if not extraction_task:
-            extraction_task = """
-            Extract ALL property listing details from this page:
-            
-            REQUIRED FIELDS:
-            - listing_url: The current page URL
-            - platform: The website name (e.g., Zillow, Realtor.com)
-            - address: Full property address
-            - price: Listed price with currency
-            - price_frequency: Rental frequency if applicable (monthly, weekly, etc.)
-            - bedrooms: Number of bedrooms
-            - bathrooms: Number of bathrooms
-            - description: Full property description (verbatim text)
-            - images: List of ALL image URLs on the page
-            - facts_and_features: Dict of property facts (sqft, year built, etc.)
-            - contact: Agent/property manager contact info
-            
-            IMPORTANT:
-            - Extract ONLY what is visible on the rendered page
-            - Include ALL image URLs you can find
-            - Return data as valid JSON
-            - If a field is not found, use null
-            """
+            extraction_task = DEFAULT_EXTRACTION_TASK
         
-        # Run the async extraction in a new event loop
+        # Run the async extraction on the shared tool loop
         try:
             logger.info("🔄 Starting async extraction...")
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(
-                self._async_extract(url, extraction_task)
-            )
-            logger.info(f"✅ Extraction completed. Result length: {len(result)} chars")
+            result = run_async(self._async_extract(url, extraction_task))
+            logger.info("✅ Extraction completed. Result length: %d chars", len(result))
             return result
         except Exception as e:
             error_msg = f"Browser extraction failed: {str(e)}"
@@ -141,26 +134,41 @@ class BrowserExtractTool(BaseTool):
                 "url": url,
                 "exception_type": type(e).__name__
             })
-        finally:
-            try:
-                loop.close()
-            except:
-                pass
     
-    async def _async_extract(self, url: str, extraction_task: str) -> str:
-        """Async browser extraction using Browser Use Cloud with Gemini."""
+    @staticmethod
+    def _config_error() -> Optional[str]:
+        """Return why the browser agent cannot run, or None if it can."""
+        if not BROWSER_USE_AVAILABLE:
+            return "browser-use package not installed. Run: pip install browser-use"
+        if not BROWSER_USE_API_KEY:
+            return "BROWSER_USE_API_KEY environment variable not set"
+        if not GOOGLE_API_KEY:
+            return "GOOGLE_API_KEY environment variable not set (required for Gemini browser agent)"
+        return None
+    
+    def _new_browser(self, keep_alive: bool = False):
+        """Create a cloud browser; ``keep_alive`` lets several agents reuse it."""
+        extra = {"keep_alive": True} if keep_alive else {}
+        return Browser(
+            use_cloud=True,
+            cloud_proxy_country_code=self.cloud_proxy_country,
+            cloud_timeout=self.cloud_timeout,
+            **extra,
+        )
+    
+    async def _async_extract(self, url: str, extraction_task: str, browser=None) -> str:
+        """Async browser extraction using Browser Use Cloud with Gemini.
         
-        browser = None
+        Uses ``browser`` when given (the caller owns and closes it); otherwise
+        a cloud browser is created for this URL and closed afterwards.
+        """
+        
+        owned = browser is None
         try:
-            logger.info("🚀 Initializing cloud browser...")
-            
-            # Initialize cloud browser
-            browser = Browser(
-                use_cloud=True,
-                cloud_proxy_country_code=self.cloud_proxy_country,
-                cloud_timeout=self.cloud_timeout,
-            )
-            logger.info("✅ Cloud browser initialized")
+            if owned:
+                logger.info("🚀 Initializing cloud browser...")
+                browser = self._new_browser()
+                logger.info("✅ Cloud browser initialized")
             
             # Initialize Google Gemini LLM for the browser agent
             logger.info("🤖 Initializing Gemini LLM...")
@@ -189,10 +197,11 @@ class BrowserExtractTool(BaseTool):
             # Run the browser agent
             logger.info("▶️ Running browser agent...")
             result = await agent.run()
-            logger.info(f"✅ Agent run completed. Result type: {type(result)}")
+            logger.info("✅ Agent run completed. Result type: %s", type(result))
             
-            # Log result attributes for debugging
-            logger.info(f"📋 Result attributes: {dir(result)}")
+            # Log result attributes for debugging (dir() is only built when shown)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📋 Result attributes: %s", dir(result))
             
             # Extract the final result
             if hasattr(result, 'final_result') and result.final_result:
@@ -222,7 +231,7 @@ class BrowserExtractTool(BaseTool):
             })
         finally:
             # Cleanup browser
-            if browser:
+            if owned and browser:
                 try:
                     logger.info("🧹 Closing browser...")
                     await browser.close()
@@ -231,10 +240,144 @@ class BrowserExtractTool(BaseTool):
                     logger.warning(f"⚠️ Browser close error: {e}")
 
 
-class BrowserNavigateTool(BaseTool):
+def _is_error_result(result: str) -> bool:
+    """True for the ``{"error": ...}`` JSON ``_async_extract`` reports failures with."""
+    try:
+        data = json.loads(result)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and "error" in data
+
+
+async def _browser_connected(browser) -> bool:
+    """Whether ``browser``'s CDP connection is still up (assumed so if unknown)."""
+    is_connected = getattr(browser, "is_connected", None)
+    if is_connected is None:
+        return True
+    try:
+        connected = is_connected()
+        if inspect.isawaitable(connected):
+            connected = await connected
+        return bool(connected)
+    except Exception:
+        return False
+
+
+class BrowserExtractBatchInput(BaseModel):
+    """Input schema for BrowserExtractBatchTool."""
+    urls: List[str] = Field(
+        ...,
+        description="The URLs of the property listing pages to extract data from."
+    )
+    extraction_task: str = Field(
+        default="Extract all property listing details including price, address, bedrooms, bathrooms, description, images, and contact information.",
+        description="Specific extraction instructions applied to every page."
+    )
+
+
+class BrowserExtractBatchTool(BrowserExtractTool):
+    """
+    Batch variant of BrowserExtractTool.
+    
+    Each URL still gets its own agent, but the batch shares at most
+    ``max_parallel`` keep-alive cloud browsers, which run at once instead of
+    one after another.
+    """
+    
+    name: str = "browser_extract_batch"
+    description: str = """
+    Extract structured data from several web pages at once using real cloud browsers.
+    Use this instead of calling browser_extract repeatedly when you have a list
+    of property listing URLs.
+    
+    Input:
+    - urls: The full URLs of the pages to extract from
+    - extraction_task: Optional specific instructions for what to extract
+    
+    Returns a JSON list with one {"url": ..., "result": ...} entry per URL, in input order.
+    """
+    args_schema: Type[BaseModel] = BrowserExtractBatchInput
+    
+    max_parallel: int = 3  # concurrent cloud browsers
+    
+    def _run(self, urls: List[str], extraction_task: str = None) -> str:
+        """Synchronous wrapper for the async batch extraction."""
+        logger.info("🌐 BrowserExtractBatchTool called with %d URLs", len(urls))
+        
+        error = self._config_error()
+        if error:
+            logger.error(f"❌ {error}")
+            return json.dumps({"error": error})
+        
+        try:
+            results = run_async(
+                self._async_extract_batch(urls, extraction_task or DEFAULT_EXTRACTION_TASK)
+            )
+        except Exception as e:
+            error_msg = f"Browser batch extraction failed: {str(e)}"
+            logger.error(f"❌ {error_msg}", exc_info=True)
+            return json.dumps({
+                "error": error_msg,
+                "urls": urls,
+                "exception_type": type(e).__name__
+            })
+        return json.dumps([
+            {"url": url, "result": result} for url, result in zip(urls, results)
+        ])
+    
+    async def _async_extract_batch(self, urls: List[str], extraction_task: str) -> List[str]:
+        """Run ``_async_extract`` for every URL, ``max_parallel`` at a time.
+        
+        The batch provisions at most ``max_parallel`` cloud browsers and hands
+        them from URL to URL, so the cold start is paid once per browser
+        rather than once per page. Browsers are closed when the batch ends.
+        """
+        pool: "asyncio.Queue" = asyncio.Queue()
+        browsers = [
+            self._new_browser(keep_alive=True)
+            for _ in range(min(self.max_parallel, len(urls)))
+        ]
+        for browser in browsers:
+            pool.put_nowait(browser)
+        
+        async def extract(url: str) -> str:
+            browser = await pool.get()
+            try:
+                result = await self._async_extract(url, extraction_task, browser)
+                # A browser that disconnected would fail every later URL given
+                # to it: swap it for a fresh one
+                if _is_error_result(result) and not await _browser_connected(browser):
+                    logger.warning("⚠️ Cloud browser disconnected, replacing it")
+                    browsers.remove(browser)
+                    try:
+                        await browser.close()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Browser close error: {e}")
+                    browser = self._new_browser(keep_alive=True)
+                    browsers.append(browser)
+                return result
+            finally:
+                pool.put_nowait(browser)
+        
+        try:
+            # _async_extract reports failures as JSON, so one bad page does not
+            # cancel the rest of the batch
+            return await asyncio.gather(*(extract(url) for url in urls))
+        finally:
+            for browser in browsers:
+                try:
+                    await browser.close()
+                except Exception as e:
+                    logger.warning(f"⚠️ Browser close error: {e}")
+
+
+class BrowserNavigateTool(BrowserExtractTool):
     """
     A simpler tool that just navigates and retrieves page content.
     Useful for quick content extraction without complex instructions.
+    
+    Shares BrowserExtractTool's browser setup and checks; only the
+    default task differs.
     """
     
     name: str = "browser_navigate"
@@ -248,11 +391,6 @@ class BrowserNavigateTool(BaseTool):
     
     def _run(self, url: str, extraction_task: str = None) -> str:
         """Navigate and extract basic content."""
-        if not BROWSER_USE_AVAILABLE:
-            return json.dumps({
-                "error": "browser-use package not installed"
-            })
-        
         # Use the same extraction logic but with simpler task
         simple_task = extraction_task or f"""
         Go to {url} and extract:
@@ -264,10 +402,10 @@ class BrowserNavigateTool(BaseTool):
         Return as JSON.
         """
         
-        extractor = BrowserExtractTool()
-        return extractor._run(url, simple_task)
+        return super()._run(url, simple_task)
 
 
 # Instantiate tools for easy import
 browser_extract_tool = BrowserExtractTool()
+browser_extract_batch_tool = BrowserExtractBatchTool()
 browser_navigate_tool = BrowserNavigateTool()
@@ -7,37 +7,279 @@ using a real local browser with anti-detection features.
 
 import os
 import asyncio
-import json
+import atexit
+import functools
+import itertools
 import logging
-from typing import Type, Optional
-from pydantic import BaseModel, Field
+import random
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Type, Optional
+from urllib.parse import urlparse
+
+import httpx
+import litellm
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from crewai.tools import BaseTool
 
+from real_ai_agents.utils.cache import tool_cache
+from real_ai_agents.utils.config import PRETTY_JSON, VERBOSE
+from real_ai_agents.utils.fastjson import dumps, dumps_bytes, loads
+from real_ai_agents.utils.loop import run_async
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Crawl4AI imports
-try:
+if TYPE_CHECKING:
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
-    from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
-    from crawl4ai.async_configs import CacheMode, LLMConfig
-    from crawl4ai.content_filter_strategy import PruningContentFilter
-    CRAWL4AI_AVAILABLE = True
+
+
+# Crawl4AI is imported on first use: its import chain (Playwright, LLM
+# clients) takes over a second and most runs never crawl.
+@functools.cache
+def _load_crawl4ai() -> Optional[SimpleNamespace]:
+    """The crawl4ai classes used here, or None when crawl4ai is not installed."""
+    try:
+        from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+        from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
+        from crawl4ai.chunking_strategy import RegexChunking
+        from crawl4ai.async_configs import CacheMode, LLMConfig
+        from crawl4ai.content_filter_strategy import BM25ContentFilter
+        from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+    except ImportError as e:
+        logger.error(f"❌ crawl4ai import failed: {e}")
+        return None
     logger.info("✅ crawl4ai package loaded successfully")
-except ImportError as e:
-    CRAWL4AI_AVAILABLE = False
-    logger.error(f"❌ crawl4ai import failed: {e}")
+    return SimpleNamespace(
+        AsyncWebCrawler=AsyncWebCrawler,
+        BrowserConfig=BrowserConfig,
+        CrawlerRunConfig=CrawlerRunConfig,
+        LLMExtractionStrategy=LLMExtractionStrategy,
+        JsonCssExtractionStrategy=JsonCssExtractionStrategy,
+        RegexChunking=RegexChunking,
+        CacheMode=CacheMode,
+        LLMConfig=LLMConfig,
+        BM25ContentFilter=BM25ContentFilter,
+        DefaultMarkdownGenerator=DefaultMarkdownGenerator,
+    )
 
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+# Successful crawls are cached per URL, so re-runs and retries skip the browser.
+CRAWL_CACHE_TTL = float(os.getenv("CRAWL_CACHE_TTL", "3600"))
+_EXTRACT_CACHE = tool_cache("crawl_extract", maxsize=256, ttl=CRAWL_CACHE_TTL)
+_SIMPLE_CACHE = tool_cache("crawl_simple", maxsize=256, ttl=CRAWL_CACHE_TTL)
+
+# Past extractions with the page's ETag / Last-Modified (as the crawl saw
+# them), kept well beyond CRAWL_CACHE_TTL. Once the result cache has expired,
+# a HEAD request showing the same validators serves the old extraction with
+# no browser or LLM call. Pages never extracted before are not HEAD-checked.
+CRAWL_REVALIDATE_TTL = float(os.getenv("CRAWL_REVALIDATE_TTL", "604800"))
+_REVALIDATE_CACHE = tool_cache("crawl_revalidate", maxsize=1024, ttl=CRAWL_REVALIDATE_TTL)
+_HEAD_TIMEOUT = 5.0
+
+
+def _validators(headers: Any) -> Optional[tuple]:
+    """``(etag, last_modified)`` from response headers, or None if there are neither."""
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    etag, last_modified = headers.get("etag"), headers.get("last-modified")
+    return (etag, last_modified) if etag or last_modified else None
+
+
+async def _page_validators(client: httpx.AsyncClient, url: str) -> Optional[tuple]:
+    """The page's current validators from a HEAD request, or None."""
+    try:
+        response = await client.head(url, follow_redirects=True)
+    except httpx.HTTPError:
+        return None
+    if response.status_code >= 400:
+        return None
+    return _validators(response.headers)
+
+
+EXTRACT_MODEL = "gemini/gemini-3-flash-preview"
+# Tokens reserved for the instruction and schema around each chunk
+_PROMPT_OVERHEAD_TOKENS = 2000
+
+
+@functools.cache
+def _chunk_token_threshold() -> int:
+    """Largest page chunk (in tokens) the extraction model takes in one call.
+
+    Sized to the model's input limit so a listing page is extracted in a
+    single call; small fixed chunks split one listing into partial results
+    that cannot be merged.
+    """
+    try:
+        max_input = litellm.get_model_info(model=EXTRACT_MODEL).get("max_input_tokens")
+    except Exception:
+        max_input = None
+    return (max_input or 32000) - _PROMPT_OVERHEAD_TOKENS
+
+
+# Page sections for chunked extraction break before markdown headings and at
+# blank lines only, so a table, list or paragraph is never cut in half (a
+# markdown table has no blank lines inside it).
+_SECTION_PATTERNS = [r"\n(?=#{1,6} )", r"\n\n"]
+
+
+# ============== SHARED CRAWLERS ==============
+# One long-lived crawler per browser setup, started on first use on the shared
+# tool loop, so each call no longer pays a Chromium launch. A crawler whose
+# browser has exited or disconnected is dropped and relaunched by the next
+# call; ordinary page failures leave it running for the other crawls on it.
+
+_CRAWLERS: dict = {}
+_CRAWLERS_LOCK = asyncio.Lock()
+
+def _browser_alive(crawler) -> bool:
+    manager = getattr(getattr(crawler, "crawler_strategy", None), "browser_manager", None)
+    browser = getattr(manager, "browser", None)
+    return browser is None or browser.is_connected()
+
+
+async def _get_crawler(name: str, browser_config) -> "AsyncWebCrawler":
+    async with _CRAWLERS_LOCK:
+        crawler = _CRAWLERS.get(name)
+        if crawler is not None and not _browser_alive(crawler):
+            logger.warning(f"⚠️ Browser for {name} crawler is gone, relaunching")
+            del _CRAWLERS[name]
+            await _close_quietly(crawler)
+            crawler = None
+        if crawler is None:
+            crawler = _load_crawl4ai().AsyncWebCrawler(config=browser_config)
+            await crawler.start()
+            _CRAWLERS[name] = crawler
+        return crawler
+
+
+async def _drop_crawler(name: str, crawler=None) -> None:
+    """Close and forget the ``name`` crawler.
+
+    With ``crawler`` given, only that instance is dropped: a caller that saw
+    an old crawler fail does not close one another call has since relaunched.
+    """
+    async with _CRAWLERS_LOCK:
+        if crawler is None or _CRAWLERS.get(name) is crawler:
+            crawler = _CRAWLERS.pop(name, None)
+        else:
+            crawler = None
+    if crawler is not None:
+        await _close_quietly(crawler)
+
+
+async def _close_quietly(crawler) -> None:
+    try:
+        await crawler.close()
+    except Exception as e:
+        logger.warning(f"⚠️ Crawler close error: {e}")
+
+
+@atexit.register
+def _close_crawlers() -> None:
+    for name in list(_CRAWLERS):
+        try:
+            run_async(_drop_crawler(name), timeout=10)
+        except Exception:
+            pass
+
+
+# BM25 query for the page filter that produces fit_markdown: only sections
+# relevant to the ListingSchema fields reach the extraction LLM, dropping
+# boilerplate such as agent bios and "similar listings" rails.
+_LISTING_QUERY = (
+    "price rent per month year bedrooms beds bathrooms baths address location "
+    "description features amenities facts contact agent phone email"
+)
+
+
+# Optional per-domain JsonCssExtractionStrategy schemas, as a JSON file of
+# {"example.com": {...schema...}}. Pages on a listed domain are extracted from
+# the DOM without an LLM call; the LLM path is only used when that result is
+# missing one of the required fields.
+CRAWL_CSS_SCHEMAS = os.getenv("CRAWL_CSS_SCHEMAS")
+_CSS_REQUIRED_FIELDS = ("address", "price", "bedrooms", "bathrooms")
+
+
+@functools.cache
+def _domain_schemas() -> dict:
+    """Load the schema registry once; a broken file disables CSS extraction."""
+    if not CRAWL_CSS_SCHEMAS:
+        return {}
+    try:
+        with open(CRAWL_CSS_SCHEMAS, "rb") as f:
+            schemas = loads(f.read())
+    except Exception as e:
+        logger.warning(f"⚠️ Cannot load CSS schemas from {CRAWL_CSS_SCHEMAS}: {e}")
+        return {}
+    if not isinstance(schemas, dict):
+        logger.warning(f"⚠️ CSS schemas in {CRAWL_CSS_SCHEMAS} are not a domain mapping")
+        return {}
+    return schemas
+
+
+def _css_schema_for(url: str) -> Optional[dict]:
+    host = (urlparse(url).hostname or "").removeprefix("www.")
+    return _domain_schemas().get(host)
+
+
+def _first_record(extracted_content: Optional[str]) -> Any:
+    """Parse extracted content; schema extraction may return a list of records."""
+    data = loads(extracted_content) if extracted_content else {}
+    if isinstance(data, list) and len(data) > 0:
+        data = data[0]
+    return data
+
+
+def _with_images(data: Any, result) -> str:
+    """Attach the images from the browser's media capture (free, no tokens)."""
+    # Top 15 images; stops reading the media list once 15 are found
+    data["images"] = list(itertools.islice(
+        (src for img in result.media.get("images", ()) if (src := img.get("src"))),
+        15,
+    ))
+    return dumps_bytes(data, indent=PRETTY_JSON).decode()
+
+
+# Extra attempts for a crawl that fails or raises (timeouts, transient
+# anti-bot blocks), with exponential backoff between them
+CRAWL_RETRIES = max(0, int(os.getenv("CRAWL_RETRIES", "2")))
+
+
+async def _arun_with_retry(crawler, url: str, config):
+    """``crawler.arun`` retried with backoff; returns the last attempt's result.
+
+    Waits with ``asyncio.sleep`` so other crawls on the loop keep running.
+    """
+    for attempt in range(CRAWL_RETRIES + 1):
+        last = attempt == CRAWL_RETRIES
+        try:
+            result = await crawler.arun(url=url, config=config)
+        except Exception as e:
+            if last:
+                raise
+            reason = str(e)
+        else:
+            if result.success or last:
+                return result
+            reason = result.error_message
+        delay = 2 ** attempt + random.random()
+        logger.warning(f"🔁 Crawl of {url} failed ({reason}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+def _split_urls(url: str) -> list[str]:
+    """Split a comma-separated URL string, dropping blanks and duplicates."""
+    return list(dict.fromkeys(u.strip() for u in url.split(",") if u.strip()))
+
 
 class CrawlExtractInput(BaseModel):
     """Input schema for CrawlExtractTool."""
     url: str = Field(
         ...,
-        description="The URL of the property listing page to extract data from."
+        description="The URL of the property listing page to extract data from. "
+                    "Pass several URLs separated by commas to crawl them concurrently."
     )
     extraction_task: str = Field(
         default="Extract all property listing details including price, address, bedrooms, bathrooms, description, images, and contact information.",
@@ -46,13 +288,170 @@ class CrawlExtractInput(BaseModel):
 
 
 class ListingSchema(BaseModel):
-    address: str = Field(..., description="Full address of the property")
-    price: str = Field(..., description="Rental price (e.g., '$3,500/mo')")
-    bedrooms: str = Field(..., description="Number of bedrooms")
-    bathrooms: str = Field(..., description="Number of bathrooms")
-    description: str = Field(..., description="Full description text")
-    facts_and_features: list[str] = Field(..., description="List of amenities and features")
-    contact_info: str = Field(..., description="Contact name or phone number")
+    # Models often return counts and prices as numbers ("bedrooms": 3); accept
+    # them as text rather than re-prompting just to stringify them
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    address: str = Field(default="N/A", description="Full address of the property")
+    price: str = Field(default="N/A", description="Rental price (e.g., '$3,500/mo')")
+    bedrooms: str = Field(default="N/A", description="Number of bedrooms")
+    bathrooms: str = Field(default="N/A", description="Number of bathrooms")
+    description: str = Field(default="N/A", description="Full description text")
+    facts_and_features: list[str] = Field(default_factory=list, description="List of amenities and features")
+    contact_info: str = Field(default="N/A", description="Contact name or phone number")
+
+
+# Gemini structured output (response_mime_type + response_schema, mapped by
+# litellm): the model returns bare JSON in the schema's shape, so the prompt
+# no longer carries formatting rules and the reply needs no fence stripping.
+_LISTING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "listing", "schema": ListingSchema.model_json_schema()},
+}
+
+
+# Persistent Chromium profile shared by both crawl tools: cookies, sessions
+# and the HTTP disk cache carry over between calls and between the tools.
+# Chromium locks a profile to one process, so both tools run on the same
+# crawler ("profile") rather than one browser each.
+USER_DATA_DIR = os.path.join(os.getcwd(), ".browser_profile")
+# Disk cache large enough to keep listing-site assets (500 MB, in bytes)
+_CHROME_ARGS = ["--disk-cache-size=524288000"]
+
+
+@functools.cache
+def _profile_browser_config() -> "BrowserConfig":
+    """Browser setup for the shared profile crawler, built once per process."""
+    # 1. Identity-Based Config (Anti-Bot Fix)
+    # Points to a persistent user profile to reuse cookies/sessions
+    os.makedirs(USER_DATA_DIR, exist_ok=True)
+
+    return _load_crawl4ai().BrowserConfig(
+        headless=True,  # Changed to True for production run, can be False for debugging
+        use_managed_browser=True,
+        user_data_dir=USER_DATA_DIR, # PERSISTENT PROFILE
+        extra_args=_CHROME_ARGS,
+        verbose=VERBOSE,
+    )
+
+
+def _extraction_instruction(extraction_task: Optional[str]) -> str:
+    return extraction_task or "Extract the rental listing details."
+
+
+# Re-prompts for an LLM extraction that does not validate against
+# ListingSchema, each with the validation error appended; 0 disables.
+EXTRACT_FIX_RETRIES = int(os.getenv("EXTRACT_FIX_RETRIES", "3"))
+# Page text sent with a re-prompt, so missing fields can be filled in
+_FIX_PAGE_CHARS = 20000
+
+
+async def _validated_listing(data: Any, extraction_task: Optional[str], result) -> Any:
+    """Return ``data`` once it fits ListingSchema, re-asking the LLM if not.
+
+    Valid data comes back with every schema field present ("N/A" defaults).
+
+    After EXTRACT_FIX_RETRIES failed corrections the last output is returned
+    as it is, so a partial extraction still reaches the agent.
+    """
+    markdown = getattr(result, "markdown", None)
+    page = (getattr(markdown, "fit_markdown", None) or str(markdown or ""))[:_FIX_PAGE_CHARS]
+    for _ in range(EXTRACT_FIX_RETRIES):
+        try:
+            # Fields the page lacks come back as their "N/A" defaults
+            return {**data, **ListingSchema.model_validate(data).model_dump()}
+        except ValidationError as e:
+            error = e
+        try:
+            response = await litellm.acompletion(
+                model=EXTRACT_MODEL,
+                api_key=GOOGLE_API_KEY,
+                response_format=_LISTING_RESPONSE_FORMAT,
+                messages=[{"role": "user", "content": (
+                    f"{_extraction_instruction(extraction_task)}\n"
+                    f"Page:\n{page}\n\n"
+                    f"Previous output: {dumps(data)}\n"
+                    f"Previous output failed validation: {error}. Return corrected JSON."
+                )}],
+            )
+            fixed = loads(response.choices[0].message.content)
+            if isinstance(fixed, dict):
+                data = fixed
+        except Exception as e:
+            logger.warning("⚠️ Extraction fix failed for %s: %s", result.url, e)
+    try:
+        return {**data, **ListingSchema.model_validate(data).model_dump()}
+    except ValidationError as e:
+        logger.warning("⚠️ Extraction does not match schema for %s: %s", result.url, e)
+    return data
+
+
+def _has_listing_data(data: Any) -> bool:
+    """True if ``data`` has at least one ListingSchema field with a real value."""
+    return isinstance(data, dict) and any(
+        (value := data.get(field)) and value != "N/A" for field in ListingSchema.model_fields
+    )
+
+
+# Listing data is usually on the page at first paint: wait for a price element
+# (up to LISTING_WAIT_TIMEOUT seconds) instead of scrolling the whole page and
+# sleeping. A crawl that times out is redone with the full-page render.
+LISTING_WAIT_TIMEOUT = float(os.getenv("LISTING_WAIT_TIMEOUT", "5"))
+_LISTING_SELECTOR = "[data-testid='price'], .listing-price, [itemprop='price']"
+_FAST_RENDER = {
+    "wait_for": f"css:{_LISTING_SELECTOR}",
+    "wait_for_timeout": int(LISTING_WAIT_TIMEOUT * 1000),
+}
+_FULL_PAGE_RENDER = {
+    "scan_full_page": True,
+    "scroll_delay": 0.5,
+    "delay_before_return_html": 3.0,
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_run_config(extraction_task: Optional[str], full_page: bool = False) -> "CrawlerRunConfig":
+    """Crawl + LLM extraction config, built once per extraction task.
+
+    The strategy, schema and prompt only depend on ``extraction_task``,
+    which is almost always the default, so calls share one config.
+
+    By default the page is captured as soon as a price element is rendered.
+    ``full_page`` is the slower fallback that scrolls the whole page and
+    waits a fixed delay, for sites where no listing selector matches.
+    """
+    # 2. Optimized Extraction Strategy (Timeout Fix)
+    # Use LLM with strict schema and focused content to avoid 600s timeout
+    c4 = _load_crawl4ai()
+    llm_config = c4.LLMConfig(
+        provider=EXTRACT_MODEL, # Faster model
+        api_token=GOOGLE_API_KEY
+    )
+
+    llm_strategy = c4.LLMExtractionStrategy(
+        llm_config=llm_config,
+        schema=ListingSchema.model_json_schema(), # Strict Schema
+        extraction_type="schema", # Structured output
+        force_json_response=True, # Parse the reply as JSON, not <blocks> tags
+        extra_args={"response_format": _LISTING_RESPONSE_FORMAT},
+        instruction=_extraction_instruction(extraction_task),
+        input_format="fit_markdown", # Reduces tokens by ~90%
+        chunk_token_threshold=_chunk_token_threshold(),
+        apply_chunking=True
+    )
+
+    return c4.CrawlerRunConfig(
+        extraction_strategy=llm_strategy,
+        chunking_strategy=c4.RegexChunking(patterns=_SECTION_PATTERNS),
+        markdown_generator=c4.DefaultMarkdownGenerator(
+            content_filter=c4.BM25ContentFilter(user_query=_LISTING_QUERY)
+        ),
+        # content_filter argument removed as it is not supported in this version of CrawlerRunConfig
+        cache_mode=c4.CacheMode.BYPASS,
+        wait_for_images=True,
+        magic=True,
+        **(_FULL_PAGE_RENDER if full_page else _FAST_RENDER),
+    )
 
 
 class CrawlExtractTool(BaseTool):
@@ -68,81 +467,133 @@ class CrawlExtractTool(BaseTool):
     args_schema: Type[BaseModel] = CrawlExtractInput
 
     def _run(self, url: str, extraction_task: str = None) -> str:
-        return asyncio.run(self._async_extract(url, extraction_task))
+        urls = _split_urls(url)
+        results = run_async(self._async_extract_all(urls, extraction_task))
+        if len(results) == 1:
+            return results[0]
+        # Each result is already a JSON document; join them instead of re-parsing
+        return "[" + ",\n".join(results) + "]"
 
     async def _async_extract(self, url: str, extraction_task: str) -> str:
-        if not CRAWL4AI_AVAILABLE:
-            return json.dumps({"error": "crawl4ai not installed"})
-
-        # 1. Identity-Based Config (Anti-Bot Fix)
-        # Points to a persistent user profile to reuse cookies/sessions
-        user_data_dir = os.path.join(os.getcwd(), ".browser_profile")
-        os.makedirs(user_data_dir, exist_ok=True)
-
-        browser_config = BrowserConfig(
-            headless=True,  # Changed to True for production run, can be False for debugging
-            use_managed_browser=True,
-            user_data_dir=user_data_dir, # PERSISTENT PROFILE
-            verbose=True
-        )
-
-        # 2. Optimized Extraction Strategy (Timeout Fix)
-        # Use LLM with strict schema and focused content to avoid 600s timeout
-        llm_config = LLMConfig(
-            provider="gemini/gemini-3-flash-preview", # Faster model
-            api_token=GOOGLE_API_KEY
-        )
-
-        llm_strategy = LLMExtractionStrategy(
-            llm_config=llm_config,
-            schema=ListingSchema.model_json_schema(), # Strict Schema
-            extraction_type="schema", # Structured output
-            instruction=f"""
-            Extract rental listing details matching the schema. 
-            Focus on accuracy. 
-            If exact value is missing, return 'N/A'.
-            {extraction_task or ''}
-            """,
-            input_format="fit_markdown", # Reduces tokens by ~90%
-            chunk_token_threshold=4000,
-            apply_chunking=True
-        )
-
-        crawl_config = CrawlerRunConfig(
-            extraction_strategy=llm_strategy,
-            # content_filter argument removed as it is not supported in this version of CrawlerRunConfig
-            cache_mode=CacheMode.BYPASS,
-            wait_for_images=True,
-            scan_full_page=True,
-            scroll_delay=0.5,
-            delay_before_return_html=3.0,
-            magic=True,
-        )
+        return (await self._async_extract_all([url], extraction_task))[0]
+
+    async def _async_extract_all(self, urls: list[str], extraction_task: str) -> list[str]:
+        """Extract every URL, crawling the uncached ones concurrently in one browser."""
+        if _load_crawl4ai() is None:
+            return [dumps({"error": "crawl4ai not installed"}) for _ in urls]
+
+        results = {url: _EXTRACT_CACHE.get((url, extraction_task)) for url in urls}
+        pending = [url for url, cached in results.items() if cached is None]
+        if not pending:
+            return [results[url] for url in urls]
+
+        # Pages extracted before: reuse the extraction if the page is unchanged
+        previous = {url: _REVALIDATE_CACHE.get((url, extraction_task)) for url in pending}
+        known = [url for url in pending if previous[url] is not None]
+        if known:
+            async with httpx.AsyncClient(timeout=_HEAD_TIMEOUT) as client:
+                current = await asyncio.gather(
+                    *(_page_validators(client, url) for url in known)
+                )
+            for url, page_validators in zip(known, current):
+                if page_validators and previous[url][0] == page_validators:
+                    logger.info(f"♻️ {url} unchanged since last extraction")
+                    results[url] = previous[url][1]
+                    _EXTRACT_CACHE.set((url, extraction_task), previous[url][1])
+            pending = [url for url in pending if results[url] is None]
+            if not pending:
+                return [results[url] for url in urls]
+
+        crawl_config = _extract_run_config(extraction_task)
 
         try:
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                logger.info(f"🕷️ Crawling {url} with persistent profile...")
+            crawler = await _get_crawler("profile", _profile_browser_config())
+        except Exception as e:
+            logger.error(f"❌ Extraction error: {str(e)}")
+            crawled = [(False, dumps({"error": str(e), "url": url}), None) for url in pending]
+        else:
+            crawled = await asyncio.gather(
+                *(self._crawl_one(crawler, url, crawl_config, extraction_task)
+                  for url in pending)
+            )
+            # _crawl_one reports failures as results, so a dead browser is
+            # spotted here and relaunched by the next call
+            if not _browser_alive(crawler):
+                await _drop_crawler("profile", crawler)
+
+        for url, (ok, result, page_validators) in zip(pending, crawled):
+            results[url] = result
+            if ok:
+                _EXTRACT_CACHE.set((url, extraction_task), result)
+                if page_validators:
+                    _REVALIDATE_CACHE.set((url, extraction_task), (page_validators, result))
+        return [results[url] for url in urls]
+
+    async def _crawl_one(
+        self, crawler, url: str, crawl_config, extraction_task: Optional[str] = None
+    ) -> tuple[bool, str, Optional[tuple]]:
+        """Crawl one URL; returns ``(succeeded, json_result, page_validators)``.
+
+        ``succeeded`` is only set for a result worth caching.
+        """
+        try:
+            # Known domains: DOM selectors first, no LLM call
+            css_schema = _css_schema_for(url)
+            if css_schema is not None:
+                logger.info(f"🧭 Crawling {url} with CSS schema...")
+                # A broken schema falls through to the LLM crawl like an incomplete one
+                try:
+                    # Without a baseSelector the default price-element wait is kept
+                    base_selector = css_schema.get("baseSelector")
+                    wait = {"wait_for": f"css:{base_selector}"} if base_selector else {}
+                    result = await crawler.arun(url=url, config=crawl_config.clone(
+                        extraction_strategy=_load_crawl4ai().JsonCssExtractionStrategy(css_schema),
+                        **wait,
+                    ))
+                    if result.success:
+                        data = _first_record(result.extracted_content)
+                        if isinstance(data, dict) and all(data.get(f) for f in _CSS_REQUIRED_FIELDS):
+                            return (
+                                True, _with_images(data, result), _validators(result.response_headers)
+                            )
+                    logger.info(f"↩️ CSS schema incomplete for {url}, using LLM extraction")
+                except Exception as e:
+                    logger.warning(f"⚠️ CSS extraction failed for {url} ({e}), using LLM extraction")
+
+            logger.info(f"🕷️ Crawling {url} with persistent profile...")
+            try:
                 result = await crawler.arun(url=url, config=crawl_config)
+            except Exception as e:
+                result = None
+                logger.info(f"⏳ Quick crawl of {url} failed ({e})")
+            if result is None or not result.success:
+                logger.info(f"📜 Rendering full page for {url}")
+                result = await _arun_with_retry(
+                    crawler, url, _extract_run_config(extraction_task, full_page=True)
+                )
 
-                if not result.success:
-                    return json.dumps({"error": f"Crawl failed: {result.error_message}", "url": url})
-                
-                # 3. Combine LLM Data + Media (Images don't need LLM)
-                data = json.loads(result.extracted_content) if result.extracted_content else {}
-                
-                # If specific schema extraction succeeded, it might be a list
-                if isinstance(data, list) and len(data) > 0:
-                    data = data[0]
-                
-                # Add images from browser media capture (free, no tokens)
-                images = [img.get("src") for img in result.media.get("images", []) if img.get("src")]
-                data["images"] = images[:15] # Top 15 images
-                
-                return json.dumps(data, indent=2)
+            if not result.success:
+                return False, dumps({"error": f"Crawl failed: {result.error_message}", "url": url}), None
+            
+            record = _first_record(result.extracted_content)
+            # A failed LLM call (429, 5xx) still crawls successfully, with an
+            # error record in place of the listing
+            if isinstance(record, dict) and record.get("error"):
+                error = record.get("content") or "LLM extraction failed"
+                return False, dumps({"error": f"Extraction failed: {error}", "url": url}), None
+
+            data = await _validated_listing(record, extraction_task, result)
+            # 3. Combine LLM Data + Media (Images don't need LLM)
+            # Only a listing with some real field is worth caching
+            return (
+                _has_listing_data(data),
+                _with_images(data, result),
+                _validators(result.response_headers),
+            )
 
         except Exception as e:
             logger.error(f"❌ Extraction error: {str(e)}")
-            return json.dumps({"error": str(e), "url": url})
+            return False, dumps({"error": str(e), "url": url}), None
 
 
 class CrawlSimpleTool(BaseTool):
@@ -155,20 +606,33 @@ class CrawlSimpleTool(BaseTool):
     args_schema: Type[BaseModel] = CrawlExtractInput
 
     def _run(self, url: str, extraction_task: str = None) -> str:
-        return asyncio.run(self._async_simple_crawl(url))
+        return run_async(self._async_simple_crawl(url))
         
     async def _async_simple_crawl(self, url: str) -> str:
+        cached = _SIMPLE_CACHE.get(url)
+        if cached is not None:
+            return cached
+        c4 = _load_crawl4ai()
+        if c4 is None:
+            return "Error: crawl4ai not installed"
+        crawler = None
         try:
-            browser_config = BrowserConfig(headless=True, verbose=False)
-            crawl_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+            crawl_config = c4.CrawlerRunConfig(cache_mode=c4.CacheMode.BYPASS)
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                result = await crawler.arun(url=url, config=crawl_config)
-                if result.success:
-                    return result.markdown[:10000] # Return first 10k chars
-                return f"Error: {result.error_message}"
+            crawler = await _get_crawler("profile", _profile_browser_config())
+            result = await _arun_with_retry(crawler, url, crawl_config)
+            if result.success:
+                markdown = result.markdown[:10000] # Return first 10k chars
+                _SIMPLE_CACHE.set(url, markdown)
+                return markdown
+            error = result.error_message or ""
         except Exception as e:
-            return f"Error: {str(e)}"
+            error = str(e)
+        # The browser is shared with extraction crawls: only close it when it
+        # is already gone, not for a failure of this one page
+        if crawler is not None and not _browser_alive(crawler):
+            await _drop_crawler("profile", crawler)
+        return f"Error: {error}"
 
 
 # Instantiate tools for easy import
@@ -1,9 +1,37 @@
-from typing import Type
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Type
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from exa_py import Exa
 import os
 
+from real_ai_agents.utils.cache import tool_cache
+from real_ai_agents.utils.config import PRETTY_JSON
+from real_ai_agents.utils.fastjson import dumps_bytes
+
+if TYPE_CHECKING:
+    from exa_py import Exa
+
+
+# Rental platforms searched in parallel by exa_search_multi (zillow is blocked)
+DEFAULT_PLATFORMS = ["realtor.com", "apartments.com", "redfin.com"]
+
+# Search results are cached by query, so retries and re-runs skip the API
+EXA_CACHE_TTL = float(os.getenv("EXA_CACHE_TTL", "3600"))
+_SEARCH_CACHE = tool_cache("exa_search", maxsize=512, ttl=EXA_CACHE_TTL)
+
+
+@lru_cache(maxsize=4)
+def _client(api_key: str) -> "Exa":
+    """One Exa client per API key, reused across searches.
+
+    exa_py is imported here rather than at module level: it takes ~0.2 s to
+    import, and every crew imports this module even if it never searches.
+    """
+    from exa_py import Exa
+
+    return Exa(api_key=api_key)
+
 
 class ExaSearchToolInput(BaseModel):
     """Input schema for ExaSearchTool."""
@@ -22,8 +50,13 @@ class ExaSearchTool(BaseTool):
         if not api_key:
             return "Error: EXA_API_KEY environment variable is missing."
         
+        key = ("search", " ".join(query.split()))
+        cached = _SEARCH_CACHE.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            exa = Exa(api_key=api_key)
+            exa = _client(api_key)
             result = exa.search_and_contents(
                 query,
                 type="auto",
@@ -31,6 +64,72 @@ class ExaSearchTool(BaseTool):
                 use_autoprompt=True,
                 highlights=True
             )
-            return str(result)
+            output = str(result)
+            _SEARCH_CACHE.set(key, output)
+            return output
         except Exception as e:
             return f"Error executing Exa Search: {str(e)}"
+
+
+class ExaMultiSearchToolInput(BaseModel):
+    """Input schema for ExaMultiSearchTool."""
+    query: str = Field(..., description="The search string, without any site: filter.")
+    platforms: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_PLATFORMS),
+        description="Listing site domains to search, one narrow search per domain.",
+    )
+
+
+class ExaMultiSearchTool(BaseTool):
+    name: str = "exa_search_multi"
+    description: str = (
+        "Searches several listing platforms at once. Runs one narrow search per "
+        "platform domain in parallel and returns the merged, de-duplicated results."
+    )
+    args_schema: Type[BaseModel] = ExaMultiSearchToolInput
+
+    def _run(self, query: str, platforms: List[str] = None) -> str:
+        api_key = os.getenv("EXA_API_KEY")
+        if not api_key:
+            return "Error: EXA_API_KEY environment variable is missing."
+
+        domains = list(dict.fromkeys(platforms or DEFAULT_PLATFORMS))
+        key = ("multi", " ".join(query.split()), tuple(domains))
+        cached = _SEARCH_CACHE.get(key)
+        if cached is not None:
+            return cached
+        exa = _client(api_key)
+
+        def search(domain: str):
+            # One failing platform must not discard the others' results
+            try:
+                return exa.search_and_contents(
+                    query,
+                    type="auto",
+                    num_results=3,
+                    include_domains=[domain],
+                    highlights=True,
+                ), None
+            except Exception as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=len(domains)) as pool:
+            outcomes = list(pool.map(search, domains))
+        responses = [response for response, error in outcomes if error is None]
+        if not responses:
+            return f"Error executing Exa Search: {str(outcomes[0][1])}"
+
+        # Merge by URL, keeping the first hit in platform order
+        merged = {}
+        for response in responses:
+            for r in response.results:
+                merged.setdefault(r.url, {
+                    "url": r.url,
+                    "title": r.title,
+                    "highlights": getattr(r, "highlights", None),
+                })
+        output = dumps_bytes(list(merged.values()), indent=PRETTY_JSON).decode()
+        # A partial merge is not cached, so the next call retries the failed platforms
+        if len(responses) == len(domains):
+            _SEARCH_CACHE.set(key, output)
+        return output
@@ -14,11 +14,16 @@ import requests
 from typing import Optional, Dict, Any
 from crewai.tools import tool
 
+from real_ai_agents.utils.fastjson import JSONDecodeError, dumps, loads, strip_fences
+
 
 # Environment variables
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_IMAGE_MODEL", "gemini-2.0-flash-exp")
 
+# One keep-alive session for Gemini and image downloads, reused across tool calls
+_SESSION = requests.Session()
+
 
 def _get_gemini_headers() -> Dict[str, str]:
     """Get headers for Gemini API requests."""
@@ -32,7 +37,7 @@ def _get_gemini_headers() -> Dict[str, str]:
 def _download_image_as_base64(image_url: str) -> Optional[str]:
     """Download an image from URL and convert to base64."""
     try:
-        response = requests.get(image_url, timeout=30)
+        response = _SESSION.get(image_url, timeout=30)
         response.raise_for_status()
         return base64.b64encode(response.content).decode("utf-8")
     except Exception as e:
@@ -127,9 +132,9 @@ def redesign_room_image(
             }
         }
         
-        response = requests.post(url, headers=_get_gemini_headers(), json=payload, timeout=120)
+        response = _SESSION.post(url, headers=_get_gemini_headers(), json=payload, timeout=120)
         response.raise_for_status()
-        result = response.json()
+        result = loads(response.content)
         
         # Extract generated image from response
         candidates = result.get("candidates", [])
@@ -160,7 +165,8 @@ def redesign_room_image(
                 "property_id": property_id
             })
         
-        return json.dumps({
+        # Carries the base64 image (often megabytes): serialize with orjson
+        return dumps({
             "success": True,
             "property_id": property_id,
             "original_image_url": image_url,
@@ -266,9 +272,9 @@ Only respond with valid JSON, no markdown formatting."""
             }
         }
         
-        response = requests.post(url, headers=_get_gemini_headers(), json=payload, timeout=60)
+        response = _SESSION.post(url, headers=_get_gemini_headers(), json=payload, timeout=60)
         response.raise_for_status()
-        result = response.json()
+        result = loads(response.content)
         
         candidates = result.get("candidates", [])
         if not candidates:
@@ -288,19 +294,12 @@ Only respond with valid JSON, no markdown formatting."""
         # Try to parse the JSON response
         try:
             # Clean up potential markdown formatting
-            clean_text = text_response.strip()
-            if clean_text.startswith("```"):
-                clean_text = clean_text.split("```")[1]
-                if clean_text.startswith("json"):
-                    clean_text = clean_text[4:]
-            clean_text = clean_text.strip()
-            
-            room_analysis = json.loads(clean_text)
+            room_analysis = loads(strip_fences(text_response))
             room_analysis["success"] = True
             room_analysis["property_id"] = property_id
             room_analysis["image_url"] = image_url
-            return json.dumps(room_analysis)
-        except json.JSONDecodeError:
+            return dumps(room_analysis)
+        except JSONDecodeError:
             return json.dumps({
                 "success": True,
                 "property_id": property_id,
@@ -1,13 +1,34 @@
 import os
 import requests
-from math import radians, sin, cos, sqrt, atan2
+from concurrent.futures import ThreadPoolExecutor
+from math import radians, cos, sqrt
+from types import MappingProxyType
 from typing import Dict, List, Any
 from crewai.tools import tool
 
+from real_ai_agents.utils.cache import tool_cache
+from real_ai_agents.utils.fastjson import JSONDecodeError, loads
+
 
 # Google Places API configuration
 GOOGLE_PLACES_BASE_URL = "https://places.googleapis.com/v1"
 
+# Identical geocode / nearby queries within a run (and across runs in the same
+# process) are answered from memory instead of re-hitting the Places API.
+GOOGLE_PLACES_CACHE_TTL = float(os.getenv("GOOGLE_PLACES_CACHE_TTL", "3600"))
+_GEOCODE_CACHE = tool_cache("places_geocode", maxsize=4096, ttl=GOOGLE_PLACES_CACHE_TTL)
+_NEARBY_CACHE = tool_cache("places_nearby", maxsize=4096, ttl=GOOGLE_PLACES_CACHE_TTL)
+
+# Keep-alive session so repeated Places calls reuse the TCP/TLS connection
+_SESSION = requests.Session()
+
+# Mean Earth radius in meters
+EARTH_RADIUS_M = 6371000
+
+# Shared read-only default for nested .get() lookups on Places responses,
+# instead of allocating a fresh {} per place
+_NO_DATA = MappingProxyType({})
+
 
 @tool("Google Places Geocode Tool")
 def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, Any]:
@@ -20,6 +41,21 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
     Returns:
         Dictionary with success status, latitude, longitude, formatted_address, name, and place_id
     """
+    return _cached_geocode(address, country)
+
+
+def _cached_geocode(address: str, country: str = None) -> Dict[str, Any]:
+    """Geocode through the in-memory TTL cache."""
+    key = (" ".join(address.lower().split()), (country or "").upper())
+    result = _GEOCODE_CACHE.get(key)
+    if result is None:
+        result = _geocode(address, country)
+        _GEOCODE_CACHE.set(key, result)
+    return dict(result)
+
+
+def _geocode(address: str, country: str = None) -> Dict[str, Any]:
+    """Call the Places Text Search API (uncached)."""
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_MAPS_API_KEY environment variable is not set")
@@ -36,9 +72,9 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
         if country:
             body["regionCode"] = country.upper()
         
-        response = requests.post(url, headers=headers, json=body, timeout=10)
+        response = _SESSION.post(url, headers=headers, json=body, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
         
         if not data.get("places") or len(data["places"]) == 0:
             return {
@@ -47,7 +83,8 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
             }
         
         place = data["places"][0]
-        location = place.get("location", {})
+        location = place.get("location", _NO_DATA)
+        name = place.get("displayName", _NO_DATA).get("text", "")
         
         # Validate that location contains valid coordinates
         try:
@@ -59,7 +96,7 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
                     "success": False,
                     "error": "Location coordinates not available for this address",
                     "formatted_address": place.get("formattedAddress", address),
-                    "name": place.get("displayName", {}).get("text", ""),
+                    "name": name,
                     "place_id": place.get("id", "")
                 }
             
@@ -72,7 +109,7 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
                 "latitude": latitude,
                 "longitude": longitude,
                 "formatted_address": place.get("formattedAddress", address),
-                "name": place.get("displayName", {}).get("text", ""),
+                "name": name,
                 "place_id": place.get("id", "")
             }
         except (ValueError, TypeError) as e:
@@ -80,7 +117,7 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
                 "success": False,
                 "error": f"Invalid coordinate format: {str(e)}",
                 "formatted_address": place.get("formattedAddress", address),
-                "name": place.get("displayName", {}).get("text", ""),
+                "name": name,
                 "place_id": place.get("id", "")
             }
         
@@ -88,7 +125,7 @@ def google_places_geocode_tool(address: str, country: str = None) -> Dict[str, A
         if e.response.status_code == 404:
             return {"success": False, "error": "Address not found"}
         raise Exception(f"Google Places geocoding API error: {str(e)}")
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, JSONDecodeError) as e:
         raise Exception(f"Google Places geocoding request failed: {str(e)}")
 
 
@@ -113,6 +150,121 @@ def google_places_nearby_tool(
     Returns:
         List of nearby places with name, category, distance, coordinates, address, rating
     """
+    return _cached_nearby(latitude, longitude, category, radius_meters, limit)
+
+
+@tool("Google Places Nearby Batch Tool")
+def google_places_nearby_batch_tool(
+    latitude: float,
+    longitude: float,
+    categories: List[str],
+    radius_meters: int = 5000,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """Find nearby points of interest for SEVERAL categories in one call.
+    
+    Prefer this over the single-category nearby tool: all categories are
+    searched concurrently and returned together.
+    
+    Args:
+        latitude: Property latitude
+        longitude: Property longitude
+        categories: List of POI categories (e.g., ["supermarket", "gym",
+                    "bus_station", "train_station", "stadium", "shopping_mall"])
+        radius_meters: Search radius in meters (default 5000m = 5km, max 50000m)
+        limit: Maximum number of results per category (max 20)
+    
+    Returns:
+        Dictionary mapping each category to its list of nearby places, or to
+        {"error": "..."} if that category's search failed
+    """
+    return _nearby_many(latitude, longitude, categories, radius_meters, limit)
+
+
+@tool("Google Places Area Scan Tool")
+def google_places_area_scan_tool(
+    address: str,
+    categories: List[str],
+    country: str = None,
+    radius_meters: int = 5000,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """Geocode an address AND find nearby places for several categories in one call.
+    
+    Prefer this for a property analysis: it replaces a geocode call followed
+    by a nearby batch call, and searches all categories concurrently.
+    
+    Args:
+        address: Property address to geocode (can be address, landmark, or place name)
+        categories: List of POI categories (e.g., ["supermarket", "gym",
+                    "bus_station", "train_station", "stadium", "shopping_mall"])
+        country: Optional ISO 3166 alpha-2 country code (e.g., 'NG' for Nigeria, 'US' for USA)
+        radius_meters: Search radius in meters (default 5000m = 5km, max 50000m)
+        limit: Maximum number of results per category (max 20)
+    
+    Returns:
+        Dictionary with "location" (the geocode result: success, latitude,
+        longitude, formatted_address, name, place_id) and "amenities"
+        (category -> list of nearby places, or {"error": "..."}). "amenities"
+        is empty when geocoding did not succeed.
+    """
+    location = _cached_geocode(address, country)
+    if not location.get("success"):
+        return {"location": location, "amenities": {}}
+    return {
+        "location": location,
+        "amenities": _nearby_many(
+            location["latitude"], location["longitude"], categories, radius_meters, limit
+        ),
+    }
+
+
+def _nearby_many(
+    latitude: float,
+    longitude: float,
+    categories: List[str],
+    radius_meters: int,
+    limit: int
+) -> Dict[str, Any]:
+    """Cached nearby searches for every category, run concurrently."""
+    categories = list(dict.fromkeys(categories))
+    if not categories:
+        return {}
+
+    def search(category: str) -> Any:
+        try:
+            return _cached_nearby(latitude, longitude, category, radius_meters, limit)
+        except Exception as e:
+            return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=min(len(categories), 8)) as pool:
+        return dict(zip(categories, pool.map(search, categories)))
+
+
+def _cached_nearby(
+    latitude: float,
+    longitude: float,
+    category: str,
+    radius_meters: int,
+    limit: int
+) -> List[Dict[str, Any]]:
+    """Nearby search through the in-memory TTL cache."""
+    key = (round(latitude, 4), round(longitude, 4), category, int(radius_meters), limit)
+    pois = _NEARBY_CACHE.get(key)
+    if pois is None:
+        pois = _nearby(latitude, longitude, category, radius_meters, limit)
+        _NEARBY_CACHE.set(key, pois)
+    return list(pois)
+
+
+def _nearby(
+    latitude: float,
+    longitude: float,
+    category: str,
+    radius_meters: int = 5000,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """Call the Places Nearby Search API (uncached)."""
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_MAPS_API_KEY environment variable is not set")
@@ -139,26 +291,31 @@ def google_places_nearby_tool(
             }
         }
         
-        response = requests.post(url, headers=headers, json=body, timeout=10)
+        response = _SESSION.post(url, headers=headers, json=body, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
+        
+        # Results lie inside the <=5 km search circle, where an equirectangular
+        # projection is within 0.1% of the haversine distance
+        cos_lat = cos(radians(latitude))
         
         pois = []
-        for place in data.get("places", []):
-            place_location = place.get("location", {})
+        for place in data.get("places", ()):
+            place_location = place.get("location", _NO_DATA)
             place_lat = place_location.get("latitude")
             place_lon = place_location.get("longitude")
             
             if place_lat is None or place_lon is None:
                 continue
             
-            distance = calculate_distance(
+            distance = local_distance(
                 latitude, longitude,
-                place_lat, place_lon
+                place_lat, place_lon,
+                cos_lat
             )
             
             pois.append({
-                "name": place.get("displayName", {}).get("text", "Unknown"),
+                "name": place.get("displayName", _NO_DATA).get("text", "Unknown"),
                 "category": category,
                 "distance_meters": round(distance, 2),
                 "latitude": place_lat,
@@ -175,34 +332,27 @@ def google_places_nearby_tool(
         if e.response.status_code == 404:
             return []
         raise Exception(f"Google Places nearby search API error: {str(e)}")
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, JSONDecodeError) as e:
         raise Exception(f"Google Places nearby search request failed: {str(e)}")
 
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two coordinates using Haversine formula.
+def local_distance(lat1: float, lon1: float, lat2: float, lon2: float, cos_lat1: float) -> float:
+    """Approximate distance between two nearby coordinates (equirectangular).
+    
+    Accurate to well under 0.1% up to a few kilometres, using only
+    multiplications and one square root.
     
     Args:
-        lat1: Latitude of first point
-        lon1: Longitude of first point
-        lat2: Latitude of second point
-        lon2: Longitude of second point
+        lat1: Latitude of the origin
+        lon1: Longitude of the origin
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+        cos_lat1: cos(radians(lat1)), computed once per origin
     
     Returns:
         Distance in meters
     """
-    # Earth radius in meters
-    R = 6371000
-    
-    # Convert to radians
-    lat1_rad = radians(lat1)
-    lat2_rad = radians(lat2)
-    delta_lat = radians(lat2 - lat1)
-    delta_lon = radians(lon2 - lon1)
-    
-    # Haversine formula
-    a = sin(delta_lat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    distance = R * c
-    
-    return distance
+    dx = radians(lon2 - lon1) * cos_lat1
+    dy = radians(lat2 - lat1)
+    return EARTH_RADIUS_M * sqrt(dx * dx + dy * dy)
+
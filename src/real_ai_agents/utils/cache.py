@@ -0,0 +1,95 @@
+"""In-process caching helpers shared by the tools."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# When set, tool caches live on disk here and are shared across processes
+TOOL_CACHE_DIR = os.getenv("TOOL_CACHE_DIR")
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after insertion.
+
+    Tools run on CrewAI worker threads (async tasks, parallel crews), so every
+    access is guarded by a lock.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class DiskTTLCache:
+    """``TTLCache``-compatible cache stored in a diskcache directory.
+
+    Lets several worker processes (or restarts) share tool results. Size is
+    bounded by diskcache's byte ``size_limit`` rather than an entry count.
+    """
+
+    def __init__(self, directory: str, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        return self._cache.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._cache.set(key, value, expire=self.ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def tool_cache(name: str, maxsize: int = 4096, ttl: float = 3600.0):
+    """Return the result cache for tool ``name``.
+
+    In memory by default; on disk under ``TOOL_CACHE_DIR/name`` when that
+    variable is set and diskcache is installed.
+    """
+    if TOOL_CACHE_DIR and DISKCACHE_AVAILABLE:
+        return DiskTTLCache(os.path.join(TOOL_CACHE_DIR, name), ttl=ttl)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,36 @@
+"""Cooperative cancellation for crews running on worker threads.
+
+``Crew.kickoff_async`` runs ``kickoff`` through ``asyncio.to_thread``, so
+cancelling the awaiting task does not stop the crew: its thread keeps making
+LLM and tool calls. Code awaited through ``cancellable`` carries a stop
+signal in a context variable, which ``asyncio.to_thread`` copies into the
+crew's thread. Global CrewAI hooks check it before every LLM and tool call,
+so a stopped crew fails at its next step instead of running to completion.
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import Any, Awaitable, Optional
+
+from crewai.hooks import register_before_llm_call_hook, register_before_tool_call_hook
+
+_STOP: ContextVar[Optional[threading.Event]] = ContextVar("crew_stop", default=None)
+
+
+def _allow_unless_stopped(context: Any) -> Optional[bool]:
+    stop = _STOP.get()
+    return False if stop is not None and stop.is_set() else None
+
+
+register_before_llm_call_hook(_allow_unless_stopped)
+register_before_tool_call_hook(_allow_unless_stopped)
+
+
+async def cancellable(coro: Awaitable[Any], stop: threading.Event) -> Any:
+    """Await ``coro`` with ``stop`` as the stop signal of every crew it starts.
+
+    Setting ``stop`` blocks the crews' further LLM and tool calls; a call
+    already in flight finishes first.
+    """
+    _STOP.set(stop)
+    return await coro
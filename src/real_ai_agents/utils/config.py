@@ -0,0 +1,64 @@
+"""Crew configuration shared by the crews: YAML loading and runtime flags."""
+
+import copy
+import functools
+import os
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml C bindings
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean environment flag.
+
+    ``1``/``true``/``yes``/``on`` (any case) enable it; any other value,
+    including an empty one, disables it. Unset flags take ``default``.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in _TRUE_VALUES
+
+
+# Agent/crew step logging is off unless REAL_AI_DEBUG=1; it prints full
+# prompts and responses on every step.
+VERBOSE = env_flag("REAL_AI_DEBUG")
+
+# Tool results are compact JSON: agents re-read them as prompt tokens, and
+# indentation only adds whitespace. TOOL_PRETTY_JSON=1 indents them for local
+# inspection.
+PRETTY_JSON = env_flag("TOOL_PRETTY_JSON")
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_yaml(config_path: str) -> Dict[str, Any]:
+    with open(config_path, encoding="utf-8") as file:
+        content = yaml.load(file, Loader=_Loader)
+    return content if isinstance(content, dict) else {}
+
+
+def load_yaml(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """Parse ``config_path`` once per process and return a fresh copy.
+
+    CrewAI rewrites the loaded dicts in place (agent names become Agent
+    objects, context names become Tasks), so each crew instance gets its own copy.
+    """
+    return copy.deepcopy(_parse_yaml(str(config_path)))
+
+
+def cached_configs(cls):
+    """Make a ``@CrewBase`` class load its agents/tasks YAML through ``load_yaml``.
+
+    Apply above ``@CrewBase``, which otherwise installs its own uncached loader.
+    """
+    cls.load_yaml = staticmethod(load_yaml)
+    return cls
@@ -0,0 +1,163 @@
+"""
+Fast JSON helpers for guardrails and flow parsing.
+
+Uses orjson when it is installed and falls back to ujson, then to the
+stdlib json module, so call sites can always rely on ``loads``/``dumps``.
+"""
+
+import json
+import re
+from typing import Any, Optional, Union
+
+JSONDecodeError = json.JSONDecodeError
+
+try:
+    import orjson
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    # keep catching the stdlib exception type.
+    JSONDecodeError = orjson.JSONDecodeError
+    BACKEND = "orjson"
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """Parse JSON from str or bytes (bytes skip the decode step)."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize to a compact JSON string."""
+        return orjson.dumps(obj).decode()
+
+    def dumps_bytes(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes, optionally indented by two spaces.
+
+        ``newline`` appends a trailing ``\n`` in the same buffer (NDJSON lines,
+        files) instead of concatenating a copy afterwards.
+        """
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    def _embed(text: Union[str, bytes], parsed: Any) -> Any:
+        return orjson.Fragment(text)
+
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = "ujson"
+
+        def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+            """Parse JSON from str or bytes."""
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            try:
+                return ujson.loads(data)
+            except ValueError as e:
+                raise JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+        def dumps(obj: Any) -> str:
+            """Serialize to a compact JSON string."""
+            return ujson.dumps(obj, ensure_ascii=False)
+
+        def dumps_bytes(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+            """Serialize to UTF-8 JSON bytes, optionally indented and newline-terminated."""
+            text = ujson.dumps(obj, ensure_ascii=False, indent=2 if indent else 0)
+            return (text + "\n" if newline else text).encode()
+
+        def _embed(text: Union[str, bytes], parsed: Any) -> Any:
+            return parsed
+
+    except ImportError:
+        BACKEND = "json"
+
+        def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+            """Parse JSON from str or bytes."""
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            return json.loads(data)
+
+        def dumps(obj: Any) -> str:
+            """Serialize to a compact JSON string."""
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+        def dumps_bytes(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+            """Serialize to UTF-8 JSON bytes, optionally indented and newline-terminated."""
+            text = json.dumps(obj, ensure_ascii=False, indent=2) if indent else dumps(obj)
+            return (text + "\n" if newline else text).encode()
+
+        def _embed(text: Union[str, bytes], parsed: Any) -> Any:
+            return parsed
+
+
+_DECODER = json.JSONDecoder()
+
+
+def raw_json(text: Any, parsed: Any = None) -> Any:
+    """Embed already-serialized JSON ``text`` in a larger ``dumps`` payload.
+
+    With orjson the text is spliced in verbatim (``orjson.Fragment``) instead
+    of being escaped into a JSON string; other backends get the parsed
+    value. Anything that is not valid JSON text is returned unchanged and so
+    serialized as a plain string. Pass ``parsed`` when the caller already
+    holds the parsed value of ``text`` to skip the validity check.
+    """
+    if not isinstance(text, (str, bytes)):
+        return text
+    if parsed is None:
+        try:
+            parsed = loads(text)
+        except JSONDecodeError:
+            return text
+    return _embed(text, parsed)
+
+
+_NON_SPACE = re.compile(r"\S")
+
+
+def first_char(text: str) -> str:
+    """First non-whitespace character of ``text``, or '' if it is blank.
+
+    A cheap shape check before parsing: output that cannot start a JSON
+    document can be rejected (or routed to fence stripping) without raising
+    and catching a decode error.
+    """
+    match = _NON_SPACE.search(text)
+    return match.group() if match else ""
+
+
+def strip_fences(text: str) -> str:
+    """Remove a markdown code fence (```json ... ```) around a JSON payload.
+
+    A fenced payload is cut at its closing fence, so prose after the fence
+    ("```\n{...}\n```\nThanks") is dropped. The text is sliced rather than
+    rewritten by ``replace``/regex passes over its whole length.
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text[3:].removeprefix("json")
+        end = text.find("```")
+        if end != -1:
+            text = text[:end]
+    elif text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def first_object(text: str) -> Optional[Any]:
+    """Parse the first JSON object embedded in ``text`` (e.g. LLM prose around JSON).
+
+    One forward scan from the first ``{`` with the C scanner; anything after
+    the object is ignored. Returns None if there is no ``{`` at all and raises
+    JSONDecodeError if the object is malformed.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        return _DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError as e:
+        raise JSONDecodeError(e.msg, e.doc, e.pos) from None
+
+
+__all__ = ["loads", "dumps", "dumps_bytes", "raw_json", "first_char", "first_object", "strip_fences", "JSONDecodeError", "BACKEND"]
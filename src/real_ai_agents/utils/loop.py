@@ -0,0 +1,31 @@
+"""Persistent event loop for the synchronous tool wrappers.
+
+CrewAI calls ``BaseTool._run`` synchronously from worker threads. Tools that
+drive async libraries submit their coroutines to one loop running forever on
+a daemon thread, instead of creating and tearing down a loop per call, so
+browsers and connections opened on it can be reused by later calls.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def tool_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared tool loop, starting its thread on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="tool-loop", daemon=True
+            ).start()
+        return _LOOP
+
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run ``coro`` on the shared tool loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, tool_loop()).result(timeout)
@@ -0,0 +1,65 @@
+"""Writers for the JSON report files produced by the crews."""
+
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from crewai.tasks.task_output import TaskOutput
+
+from real_ai_agents.utils.fastjson import JSONDecodeError, dumps_bytes, loads
+
+
+def write_bytes(path: str, data: bytes, append: bool = False) -> None:
+    """Write (or append) ``data`` to ``path``, creating its directory if needed.
+
+    A full write goes to a temporary file that then replaces ``path``, so
+    readers never see a half-written report.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    if append:
+        with open(path, "ab") as f:
+            f.write(data)
+        return
+    # Unique per writer: concurrent pipelines may write the same report
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def report_writer(
+    path: str, parse: Optional[Callable[[str], Any]] = None
+) -> Callable[[TaskOutput], None]:
+    """Return a task callback that writes the task's JSON output to ``path``.
+
+    Replaces ``output_file``: the output is parsed (with ``parse``, default
+    ``loads``) and re-serialized indented in one pass. Output that does not
+    parse is written as-is, like ``output_file`` would.
+    """
+    parse = parse or loads
+
+    def write(output: TaskOutput) -> None:
+        try:
+            data = dumps_bytes(parse(output.raw), indent=True, newline=True)
+        except (JSONDecodeError, TypeError, ValueError):
+            data = str(output.raw).encode()
+        write_bytes(path, data)
+
+    return write
+
+
+def append_ndjson(path: str, raw: Any) -> None:
+    """Append one JSON document to ``path`` as a single NDJSON line."""
+    try:
+        line = dumps_bytes(
+            loads(raw) if isinstance(raw, (str, bytes, bytearray)) else raw, newline=True
+        )
+    except (JSONDecodeError, TypeError, ValueError):
+        line = dumps_bytes(str(raw), newline=True)
+    write_bytes(path, line, append=True)
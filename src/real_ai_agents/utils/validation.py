@@ -0,0 +1,41 @@
+"""Pydantic helpers for guardrails: error feedback and cached output schemas."""
+
+import copy
+from typing import Any, Dict, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+
+def format_validation_errors(exc: ValidationError) -> str:
+    """Render a ValidationError as one ``location: message`` line per error."""
+    lines = []
+    for err in exc.errors():
+        loc = ".".join(str(part) for part in err["loc"]) or "output"
+        lines.append(f"{loc}: {err['msg']}")
+    return "\n".join(lines)
+
+
+def is_json_error(exc: ValidationError) -> bool:
+    """True if ``model_validate_json`` failed because the input was not JSON at all."""
+    return any(err["type"] == "json_invalid" for err in exc.errors())
+
+
+_SCHEMA_CACHE: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+
+class CachedSchemaModel(BaseModel):
+    """BaseModel whose JSON schema is generated once per class and argument set.
+
+    CrewAI rebuilds the ``output_json`` schema on every task execution and
+    conversion; pydantic does not cache ``model_json_schema``. Callers get a
+    copy because CrewAI post-processes the schema dict in place.
+    """
+
+    @classmethod
+    def model_json_schema(cls, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
+            schema = super().model_json_schema(*args, **kwargs)
+            _SCHEMA_CACHE[key] = schema
+        return copy.deepcopy(schema)
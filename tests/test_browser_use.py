@@ -1,8 +1,9 @@
-import requests
-import time
+import asyncio
 import os
 
-BROWSER_USE_API_KEY = os.getenv("BROWSER_USE_API_KEY")
+import httpx
+
+BROWSER_USE_API_KEY = os.getenv("BROWSER_USE_API_KEY", "")
 MCP_URL = "https://api.browser-use.com/mcp"
 
 HEADERS = {
@@ -10,55 +11,66 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
-# 1️⃣ Start browser task
-start_payload = {
-    "tool": "browser_task",
-    "arguments": {
-        "task": """
-        Go to https://www.zillow.com.
-        In the search box, search for "2 bedroom apartments for rent in New York".
-        Wait for results to load.
-        Scroll the page to load listings.
-        Click the first rental listing.
-        Wait for the listing page to fully load.
-
-        Extract the following from the listing page:
-        - Address
-        - Rent price
-        - Bedrooms and bathrooms
-        - First 5 image URLs
-        - Listing description
-
-        Return the result as JSON.
-        """,
-        "max_steps": 10
-    }
-}
+ZILLOW_TASK = """
+Go to https://www.zillow.com.
+In the search box, search for "2 bedroom apartments for rent in New York".
+Wait for results to load.
+Scroll the page to load listings.
+Click the first rental listing.
+Wait for the listing page to fully load.
+
+Extract the following from the listing page:
+- Address
+- Rent price
+- Bedrooms and bathrooms
+- First 5 image URLs
+- Listing description
+
+Return the result as JSON.
+"""
+
 
-response = requests.post(MCP_URL, headers=HEADERS, json=start_payload)
-response.raise_for_status()
-task_id = response.json()["task_id"]
+async def run_browser_task(client: httpx.AsyncClient, task: str, max_steps: int = 10) -> dict:
+    """Start a browser task and poll it until it completes or fails."""
+    # 1️⃣ Start browser task
+    response = await client.post(MCP_URL, json={
+        "tool": "browser_task",
+        "arguments": {"task": task, "max_steps": max_steps},
+    })
+    response.raise_for_status()
+    task_id = response.json()["task_id"]
 
-print("✅ Started browser task:", task_id)
+    print("✅ Started browser task:", task_id)
 
-# 2️⃣ Monitor task
-while True:
-    poll_payload = {
-        "tool": "monitor_task",
-        "arguments": {
-            "task_id": task_id
-        }
-    }
+    # 2️⃣ Monitor task (backing off between polls: 2s, 3s, 4.5s, ... capped at 10s)
+    delay = 2.0
+    while True:
+        poll_resp = await client.post(MCP_URL, json={
+            "tool": "monitor_task",
+            "arguments": {"task_id": task_id},
+        })
+        poll_resp.raise_for_status()
+        status = poll_resp.json()
 
-    poll_resp = requests.post(MCP_URL, headers=HEADERS, json=poll_payload)
-    poll_resp.raise_for_status()
-    status = poll_resp.json()
+        print(f"⏳ [{task_id}] Status:", status["status"])
 
-    print("⏳ Status:", status["status"])
+        if status["status"] in ("completed", "failed"):
+            return status
 
-    if status["status"] in ("completed", "failed"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 10.0)
+
+
+async def main(tasks=(ZILLOW_TASK,)):
+    # One keep-alive client for every start request and poll; several tasks
+    # are started and polled concurrently
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30.0) as client:
+        results = await asyncio.gather(*(run_browser_task(client, task) for task in tasks))
+
+    for status in results:
         print("\n===== FINAL RESULT =====")
         print(status.get("result"))
-        break
 
-    time.sleep(2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
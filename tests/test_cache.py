@@ -0,0 +1,56 @@
+from real_ai_agents.utils import cache
+from real_ai_agents.utils.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    c = TTLCache(ttl=10)
+    c.set("a", 1)
+
+    clock.now += 9
+    assert c.get("a") == 1
+
+    clock.now += 2
+    assert c.get("a") is None
+    assert c.get("a", "missing") == "missing"
+    assert len(c) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    c = TTLCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the least recently used
+    c.set("c", 3)
+
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+    assert len(c) == 2
+
+
+def test_ttl_cache_set_refreshes_entry(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    c = TTLCache(ttl=10)
+    c.set("a", 1)
+    clock.now += 8
+    c.set("a", 2)
+    clock.now += 8
+    assert c.get("a") == 2
+
+
+def test_ttl_cache_clear():
+    c = TTLCache()
+    c.set("a", 1)
+    c.clear()
+    assert len(c) == 0
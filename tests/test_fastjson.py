@@ -0,0 +1,77 @@
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from real_ai_agents.utils import fastjson
+from real_ai_agents.utils.fastjson import JSONDecodeError, dumps, first_object, raw_json, strip_fences
+
+
+def _load_fastjson_without_orjson(monkeypatch):
+    """Import a separate copy of fastjson as if orjson were not installed."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("_fastjson_no_orjson", fastjson.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": 1}',
+    '```json\n{"a": 1}\n```',
+    '```\n{"a": 1}\n```',
+    '  ```json\n{"a": 1}\n```  ',
+    '{"a": 1}\n```',
+])
+def test_strip_fences(text):
+    assert strip_fences(text) == '{"a": 1}'
+
+
+def test_strip_fences_drops_prose_after_closing_fence():
+    assert strip_fences('```json\n{"a": 1}\n```\nHope this helps!') == '{"a": 1}'
+
+
+def test_strip_fences_keeps_unclosed_fence_payload():
+    assert strip_fences('```json\n{"a": 1}') == '{"a": 1}'
+
+
+def test_first_object_ignores_surrounding_prose():
+    assert first_object('Here you go: {"a": {"b": [1]}} and a } later') == {"a": {"b": [1]}}
+
+
+def test_first_object_without_object():
+    assert first_object("no json here") is None
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '{"a": }', "prose {not json}"])
+def test_first_object_malformed(text):
+    with pytest.raises(JSONDecodeError):
+        first_object(text)
+
+
+def test_first_object_error_is_stdlib_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        first_object('{"a": ')
+
+
+def test_raw_json_embeds_valid_json():
+    assert json.loads(dumps({"inner": raw_json('{"a": [1, 2]}')})) == {"inner": {"a": [1, 2]}}
+
+
+def test_raw_json_keeps_invalid_text_as_string():
+    assert json.loads(dumps({"inner": raw_json("not json")})) == {"inner": "not json"}
+
+
+def test_raw_json_passes_non_text_through():
+    value = {"a": 1}
+    assert raw_json(value) is value
+
+
+def test_raw_json_without_orjson(monkeypatch):
+    module = _load_fastjson_without_orjson(monkeypatch)
+    assert module.BACKEND != "orjson"
+    assert module.raw_json('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert module.raw_json('{"a": 1}', parsed={"a": 1}) == {"a": 1}
+    assert module.raw_json("not json") == "not json"
+    assert json.loads(module.dumps({"inner": module.raw_json('{"a": 1}')})) == {"inner": {"a": 1}}
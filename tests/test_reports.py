@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from real_ai_agents.utils.reports import write_bytes
+
+
+def test_write_bytes_creates_directory(tmp_path):
+    path = tmp_path / "output" / "report.json"
+    write_bytes(str(path), b"{}")
+    assert path.read_bytes() == b"{}"
+
+
+def test_write_bytes_replaces_atomically(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_bytes(b"old content that is longer")
+    write_bytes(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    # The temporary file was renamed over the report, not left behind
+    assert os.listdir(tmp_path) == ["report.json"]
+
+
+def test_write_bytes_cleans_up_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "report.json"
+    path.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_bytes(str(path), b"new")
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["report.json"]
+
+
+def test_write_bytes_appends(tmp_path):
+    path = tmp_path / "log.ndjson"
+    write_bytes(str(path), b"1\n", append=True)
+    write_bytes(str(path), b"2\n", append=True)
+    assert path.read_bytes() == b"1\n2\n"